@@ -1,15 +1,26 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Response, Request, Header
+from fastapi.responses import StreamingResponse, JSONResponse
 from typing import Optional
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 from typing import List
 
-from concurrent.futures import ThreadPoolExecutor
 import peewee
+from playhouse.sqlite_ext import FTS5Model, SearchField, RowIDField
 from pydantic import BaseModel, Field
 
 import asyncio
+import json
+import math
+import time
+
+from db_pool import create_database
+from db_executor import DBExecutor, ExecutorBusyError
+from ttl_cache import TTLCache, MISSING
+from rate_limiter import RateLimit, RateLimitMiddleware, ShardedRateLimiter
+from conditional_request import (make_etag, etag_matches, is_not_modified,
+                                 has_conditional_headers, validator_headers)
 
 app = FastAPI()
 
@@ -23,14 +34,60 @@ PORT = os.getenv("PORT", "8000")
 
 print("DB_NAME", DB_NAME)
 
-db = peewee.SqliteDatabase(DB_NAME)
+# 쓰레드별 연결 재사용 + WAL 모드가 적용된 SQLite 연결 관리자
+db = create_database(DB_NAME)
+
+# 쓰기 전용 쓰레드 1개 + 읽기 쓰레드 풀 (동기 작업 처리용)
+db_executor = DBExecutor()
+
+PAGE_SIZE_DEFAULT = 100    # 목록 조회 기본 페이지 크기
+PAGE_SIZE_MAX = 1000       # 한 번에 조회할 수 있는 최대 행 수
+STREAM_CHUNK_SIZE = 500    # NDJSON 스트리밍 시 한 번에 읽어오는 행 수
+
+WRITE_BATCH_MAX_ROWS = 200      # 한 트랜잭션으로 모아서 커밋할 최대 행 수
+WRITE_BATCH_WINDOW_SEC = 0.005  # 동시에 들어온 생성 요청을 모으는 시간 (5ms)
+INSERT_CHUNK_SIZE = 500         # insert_many 한 문장에 넣는 행 수 (SQLite 변수 개수 제한 대비)
+BULK_CREATE_MAX = 1000          # POST /items/bulk 한 번에 받을 수 있는 최대 아이템 수
+
+SEARCH_LIMIT_DEFAULT = 20        # 검색 결과 기본 개수
+SEARCH_LIMIT_MAX = 100           # 검색 결과 최대 개수
+
+ITEM_CACHE_SIZE = 10000         # 단건 조회 캐시에 보관할 최대 아이템 수
+ITEM_CACHE_TTL = 60             # 캐시된 아이템의 유효 시간 (초)
+ITEM_CACHE_NEGATIVE_TTL = 2     # 없는 아이템(404)을 캐싱하는 시간 (초)
+
+# GET /items/{item_id} 앞단의 읽기 캐시 (생성/수정/삭제 시 해당 id만 무효화)
+item_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
 
-executor = ThreadPoolExecutor(max_workers=20) # 쓰레드 풀 생성 (동기 작업 처리용)
+# 클라이언트 IP별 요청 한도 (한 클라이언트가 실행기와 DB를 독차지하지 못하게 합니다)
+IP_RATE_LIMITS = {
+    "/items/bulk": RateLimit(10, 60),           # 대량 생성은 분당 10번
+}
+RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "600"))  # 그 밖의 경로의 분당 한도 (0이면 제한 없음)
+DEFAULT_IP_RATE_LIMIT = RateLimit(RATE_LIMIT_PER_MINUTE, 60, burst=200) if RATE_LIMIT_PER_MINUTE else None
 
-async def run_in_executor(func, *args, **kwargs):
-    """동기 Peewee 작업을 별도의 쓰레드에서 실행하고 비동기로 결과를 기다립니다."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(executor, func, *args, **kwargs)
+rate_limiter = ShardedRateLimiter()
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter,
+                   route_limits=IP_RATE_LIMITS, default_limit=DEFAULT_IP_RATE_LIMIT)
+
+async def run_in_executor(func, *args, write: bool = False):
+    """
+    동기 Peewee 작업을 별도의 쓰레드에서 실행하고 비동기로 결과를 기다립니다.
+    - write=True 이면 쓰기 전용 쓰레드에서, 아니면 읽기 쓰레드 풀에서 실행합니다.
+    - 대기열이 가득 차면 ExecutorBusyError가 발생합니다. (503 + Retry-After)
+    """
+    if write:
+        return await db_executor.write(func, *args)
+    return await db_executor.read(func, *args)
+
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request, exc: ExecutorBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"서버가 바쁩니다. ({exc.lane} 대기열 가득 참)"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 class BaseModelPeewee(peewee.Model):
     class Meta:
@@ -39,23 +96,243 @@ class BaseModelPeewee(peewee.Model):
 # Peewee ORM 모델 정의
 class ItemPeewee(BaseModelPeewee):
     name = peewee.CharField(index=True)
-    price = peewee.FloatField()
+    price = peewee.FloatField(index=True)  # 전체 최소/최대 가격을 인덱스로 바로 찾기 위함
+
+# 이름 검색용 FTS5 색인 (ItemPeewee를 content 테이블로 쓰는 외부 콘텐츠 방식)
+class ItemSearchIndex(FTS5Model):
+    rowid = RowIDField()
+    name = SearchField()
+
+    class Meta:
+        database = db
+        table_name = "item_search"
+        options = {
+            "content": ItemPeewee,
+            "content_rowid": "id",
+            "tokenize": "unicode61 remove_diacritics 2",
+            "prefix": "'2 3'",  # 2~3글자 접두어 색인 (접두어 검색 가속)
+        }
+
+# ItemPeewee가 바뀔 때 검색 색인도 같은 트랜잭션 안에서 함께 바뀌도록 하는 트리거
+SEARCH_INDEX_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS itempeewee_search_ai AFTER INSERT ON itempeewee BEGIN
+        INSERT INTO item_search(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS itempeewee_search_ad AFTER DELETE ON itempeewee BEGIN
+        INSERT INTO item_search(item_search, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS itempeewee_search_au AFTER UPDATE OF name ON itempeewee BEGIN
+        INSERT INTO item_search(item_search, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO item_search(rowid, name) VALUES (new.id, new.name);
+    END""",
+]
+
+# 가격 통계 요약 테이블 (전체 1행 + 이름 접두어별 1행)
+# ItemPeewee가 바뀔 때 트리거가 같은 트랜잭션 안에서 증분으로 갱신합니다.
+class ItemPriceStats(BaseModelPeewee):
+    scope = peewee.CharField()                # 'all' (전체) 또는 'prefix' (이름 접두어별)
+    prefix = peewee.CharField()               # scope='all' 이면 빈 문자열
+    item_count = peewee.IntegerField()
+    total = peewee.FloatField()
+    min_price = peewee.FloatField(null=True)
+    max_price = peewee.FloatField(null=True)
+
+    class Meta:
+        table_name = "item_price_stats"
+        primary_key = peewee.CompositeKey("scope", "prefix")
+
+STATS_PREFIX_LENGTH = 2  # 이름 앞 몇 글자(소문자)로 묶을지
+
+def stats_bucket_sql(name_column: str) -> str:
+    """이름 접두어 버킷을 계산하는 SQL 식 (아래 표현식 인덱스와 글자 하나까지 같아야 합니다)"""
+    return f"lower(substr({name_column}, 1, {STATS_PREFIX_LENGTH}))"
+
+# 접두어 버킷의 최소/최대 가격을 다시 구할 때 사용하는 표현식 인덱스
+STATS_BUCKET_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS itempeewee_stats_bucket "
+    f"ON itempeewee ({stats_bucket_sql('name')}, price)"
+)
+
+def stats_add_sql(row: str) -> str:
+    """row(new) 한 행을 전체/접두어 버킷에 더하는 SQL"""
+    bucket = stats_bucket_sql(f"{row}.name")
+    return f"""
+        INSERT INTO item_price_stats (scope, prefix, item_count, total, min_price, max_price)
+        VALUES ('all', '', 1, {row}.price, {row}.price, {row}.price),
+               ('prefix', {bucket}, 1, {row}.price, {row}.price, {row}.price)
+        ON CONFLICT (scope, prefix) DO UPDATE SET
+            item_count = item_count + 1,
+            total = total + excluded.total,
+            min_price = min(min_price, excluded.min_price),
+            max_price = max(max_price, excluded.max_price);"""
+
+def stats_remove_sql(row: str) -> str:
+    """
+    row(old) 한 행을 전체/접두어 버킷에서 빼는 SQL
+    빠진 가격이 최소/최대값이었을 때만 인덱스로 다시 구합니다. (O(log n))
+    """
+    bucket = stats_bucket_sql(f"{row}.name")
+    is_boundary = f"({row}.price <= min_price OR {row}.price >= max_price)"
+    return f"""
+        UPDATE item_price_stats SET item_count = item_count - 1, total = total - {row}.price
+        WHERE (scope = 'all' AND prefix = '') OR (scope = 'prefix' AND prefix = {bucket});
+        UPDATE item_price_stats SET
+            min_price = (SELECT min(price) FROM itempeewee),
+            max_price = (SELECT max(price) FROM itempeewee)
+        WHERE scope = 'all' AND prefix = '' AND {is_boundary};
+        UPDATE item_price_stats SET
+            min_price = (SELECT min(price) FROM itempeewee WHERE {stats_bucket_sql('name')} = item_price_stats.prefix),
+            max_price = (SELECT max(price) FROM itempeewee WHERE {stats_bucket_sql('name')} = item_price_stats.prefix)
+        WHERE scope = 'prefix' AND prefix = {bucket} AND {is_boundary};
+        DELETE FROM item_price_stats WHERE item_count <= 0;"""
+
+PRICE_STATS_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_stats_ai AFTER INSERT ON itempeewee BEGIN
+        {stats_add_sql("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_stats_ad AFTER DELETE ON itempeewee BEGIN
+        {stats_remove_sql("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_stats_au AFTER UPDATE OF name, price ON itempeewee BEGIN
+        {stats_remove_sql("old")}
+        {stats_add_sql("new")}
+    END""",
+]
+
+# 아이템별 버전 (생성/수정될 때마다 그 시점의 테이블 버전 값을 받습니다)
+class ItemVersion(BaseModelPeewee):
+    item_id = peewee.IntegerField(primary_key=True)
+    version = peewee.IntegerField()
+    updated_at = peewee.IntegerField()  # unix time (초)
+
+    class Meta:
+        table_name = "item_version"
+
+# 아이템 테이블 전체의 버전 (id=1 한 행, 생성/수정/삭제마다 1씩 증가)
+class ItemTableVersion(BaseModelPeewee):
+    version = peewee.IntegerField()
+    updated_at = peewee.IntegerField()  # unix time (초)
+
+    class Meta:
+        table_name = "item_table_version"
+
+BUMP_TABLE_VERSION_SQL = """
+        UPDATE item_table_version
+        SET version = version + 1, updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+        WHERE id = 1;"""
+
+def set_item_version_sql(row: str) -> str:
+    return f"""
+        INSERT OR REPLACE INTO item_version (item_id, version, updated_at)
+        SELECT {row}.id, version, updated_at FROM item_table_version WHERE id = 1;"""
+
+# ETag / Last-Modified에 쓰는 버전을 쓰기와 같은 트랜잭션 안에서 올리는 트리거
+ITEM_VERSION_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_version_ai AFTER INSERT ON itempeewee BEGIN
+        {BUMP_TABLE_VERSION_SQL}
+        {set_item_version_sql("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_version_au AFTER UPDATE ON itempeewee BEGIN
+        {BUMP_TABLE_VERSION_SQL}
+        {set_item_version_sql("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS itempeewee_version_ad AFTER DELETE ON itempeewee BEGIN
+        {BUMP_TABLE_VERSION_SQL}
+        DELETE FROM item_version WHERE item_id = old.id;
+    END""",
+]
 
 # DB 및 테이블 초기화 함수
 def create_tables():
     """테이블이 없으면 생성합니다."""
     with db:
-        db.create_tables([ItemPeewee]) #if not exists
+        search_index_exists = ItemSearchIndex.table_exists()
+        price_stats_exists = ItemPriceStats.table_exists()
+        item_versions_exist = ItemTableVersion.table_exists()
+        db.create_tables([ItemPeewee, ItemSearchIndex, ItemPriceStats,
+                          ItemVersion, ItemTableVersion]) #if not exists
+        db.execute_sql(STATS_BUCKET_INDEX)
+        for trigger_sql in SEARCH_INDEX_TRIGGERS + PRICE_STATS_TRIGGERS + ITEM_VERSION_TRIGGERS:
+            db.execute_sql(trigger_sql)
+        # 기존 DB에 색인/요약 테이블을 처음 만든 경우 이미 있는 아이템으로 채웁니다.
+        if not search_index_exists:
+            ItemSearchIndex.rebuild()
+        if not price_stats_exists:
+            rebuild_price_stats_pure()
+        if not item_versions_exist:
+            init_item_versions_pure()
+
+
+def rebuild_search_index():
+    """ItemPeewee 전체 내용으로 검색 색인을 다시 만듭니다. (python CRUD.py rebuild-search-index)"""
+    with db:
+        ItemSearchIndex.rebuild()
+        ItemSearchIndex.optimize()
+
+
+def init_item_versions_pure():
+    """버전 테이블을 처음 만들 때 테이블 버전 행을 만들고, 이미 있는 아이템에 버전 1을 줍니다."""
+    now = int(time.time())
+    ItemTableVersion.insert(id=1, version=1, updated_at=now).on_conflict_replace().execute()
+    ItemVersion.insert_from(
+        ItemPeewee.select(ItemPeewee.id, peewee.Value(1), peewee.Value(now)),
+        [ItemVersion.item_id, ItemVersion.version, ItemVersion.updated_at],
+    ).on_conflict_replace().execute()
+
+
+def recompute_price_stats_pure() -> dict:
+    """ItemPeewee 전체를 집계해서 {(scope, prefix): (개수, 합계, 최소, 최대)}를 만듭니다."""
+    aggregates = (peewee.fn.COUNT(ItemPeewee.id), peewee.fn.SUM(ItemPeewee.price),
+                  peewee.fn.MIN(ItemPeewee.price), peewee.fn.MAX(ItemPeewee.price))
+    bucket = peewee.SQL(stats_bucket_sql('"name"'))
+    result = {}
+    overall = ItemPeewee.select(*aggregates).tuples().get()
+    if overall[0]:
+        result[("all", "")] = overall
+    for prefix, *values in ItemPeewee.select(bucket, *aggregates).group_by(bucket).tuples():
+        result[("prefix", prefix)] = tuple(values)
+    return result
+
+
+def rebuild_price_stats_pure():
+    """가격 통계 요약 테이블을 전체 집계 결과로 다시 채웁니다."""
+    rows = [
+        {"scope": scope, "prefix": prefix, "item_count": count, "total": total,
+         "min_price": min_price, "max_price": max_price}
+        for (scope, prefix), (count, total, min_price, max_price) in recompute_price_stats_pure().items()
+    ]
+    with db.atomic():
+        ItemPriceStats.delete().execute()
+        for chunk in peewee.chunked(rows, INSERT_CHUNK_SIZE):
+            ItemPriceStats.insert_many(chunk).execute()
+
+
+def verify_price_stats_pure() -> List[str]:
+    """요약 테이블을 전체 재집계 결과와 비교하고, 다른 항목을 설명하는 문자열 목록을 반환합니다."""
+    expected = recompute_price_stats_pure()
+    actual = {
+        (row.scope, row.prefix): (row.item_count, row.total, row.min_price, row.max_price)
+        for row in ItemPriceStats.select()
+    }
+    problems = []
+    for key in sorted(set(expected) | set(actual)):
+        want, got = expected.get(key), actual.get(key)
+        # 합계는 증감을 반복하며 부동소수점 오차가 쌓일 수 있으므로 근사 비교합니다.
+        if want is None or got is None or want[0] != got[0] or want[2:] != got[2:] \
+                or not math.isclose(want[1], got[1], rel_tol=1e-9, abs_tol=1e-6):
+            problems.append(f"{key}: expected={want} actual={got}")
+    return problems
 
 
 create_tables()
 def db_operation(func, *args, **kwargs):
     """
-    Peewee Context Manager를 사용하여 DB 연결을 열고,
-    작업 완료 후 자동으로 닫는 동기 래퍼 함수입니다.
+    Peewee Context Manager를 사용하여 DB 연결을 빌리고,
+    작업 완료 후 자동으로 반납하는 동기 래퍼 함수입니다.
     """
     try:
         # with db: 블록이 db.connect()와 db.close()를 자동으로 처리합니다.
+        # 연결 관리자가 실제 연결을 닫지 않고 풀에 반납하므로 연결 비용이 들지 않습니다.
         with db:
             return func(*args, **kwargs)
     except Exception as e:
@@ -68,8 +345,8 @@ class ItemBase(BaseModel):
     price: float = Field(gt=0, example=35.00)
 
 class ItemUpdate(BaseModel):
-    name: Optional[str] = None
-    price: Optional[float] = None
+    name: Optional[str] = Field(None, min_length=3, max_length=50)
+    price: Optional[float] = Field(None, gt=0)
 
 # 응답 모델 (Peewee 객체를 Pydantic으로 변환할 때 사용)
 class Item(ItemBase):
@@ -79,6 +356,114 @@ class Item(ItemBase):
     class Config:
         from_attributes = True # Pydantic v2
 
+# 가격 통계 응답 모델
+class PriceStats(BaseModel):
+    count: int = 0
+    sum: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+
+class ItemStats(BaseModel):
+    overall: PriceStats
+    prefix: Optional[str] = None
+    by_prefix: Optional[PriceStats] = None
+
+
+# 여러 행 생성 - 순수한 CRUD 로직만 포함
+def insert_items_pure(rows: List[dict]) -> List[int]:
+    """
+    rows를 insert_many로 저장하고, 입력 순서대로 할당된 id 목록을 반환합니다.
+    db_operation(with db:) 안에서 호출되므로 전체가 하나의 트랜잭션으로 커밋됩니다.
+    """
+    ids = []
+    for chunk in peewee.chunked(rows, INSERT_CHUNK_SIZE):
+        cursor = ItemPeewee.insert_many(chunk).returning(ItemPeewee.id).tuples().execute()
+        # 새 rowid는 '현재 최대값 + 1'로 순서대로 증가하므로 정렬하면 입력 순서와 같습니다.
+        ids.extend(sorted(row[0] for row in cursor))
+    return ids
+
+
+class ItemWriteBatcher:
+    """
+    동시에 들어온 아이템 생성 요청을 잠깐(window) 모았다가
+    한 번의 insert_many / 한 번의 트랜잭션으로 커밋하는 쓰기 병합기입니다.
+    요청마다 트랜잭션(fsync)을 하나씩 쓰지 않으므로 동시 쓰기 처리량이 올라갑니다.
+    """
+
+    def __init__(self, max_rows: int = WRITE_BATCH_MAX_ROWS, window: float = WRITE_BATCH_WINDOW_SEC):
+        self.max_rows = max_rows
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, rows: List[dict]) -> List[int]:
+        """rows를 다음 묶음에 넣고, 커밋이 끝나면 각 행에 할당된 id 목록을 돌려받습니다."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    async def _collect(self):
+        """첫 요청이 들어온 뒤 window 동안, 또는 max_rows가 찰 때까지 요청을 모읍니다."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        count = len(batch[0][0])
+        deadline = loop.time() + self.window
+        while count < self.max_rows:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(entry)
+            count += len(entry[0])
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            rows = [row for entry_rows, _ in batch for row in entry_rows]
+            try:
+                ids = await run_in_executor(db_operation, insert_items_pure, rows, write=True)
+            except Exception as e:
+                # 묶음 전체가 하나의 트랜잭션이므로 실패하면 모든 요청에 같은 오류를 전달합니다.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                    self._queue.task_done()
+                continue
+
+            position = 0
+            for entry_rows, future in batch:
+                if not future.done():
+                    future.set_result(ids[position:position + len(entry_rows)])
+                position += len(entry_rows)
+                self._queue.task_done()
+
+    async def close(self):
+        """남은 요청을 모두 커밋한 뒤 병합 작업을 종료합니다."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        self._task = None
+
+
+item_write_batcher = ItemWriteBatcher()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """서버 종료 시 아직 커밋되지 않은 생성 요청을 마저 처리하고 연결 풀을 닫습니다."""
+    await item_write_batcher.close()
+    db_executor.shutdown()
+    db.close_all()
+
 
 # Create (POST) {"name": "testuser", "price": 1.0}
 @app.post("/items/", response_model=Item, status_code=status.HTTP_201_CREATED)
@@ -86,67 +471,438 @@ async def create_item(item: ItemBase):
     """
     새로운 아이템을 생성합니다.
     - 요청 본문은 ItemBase 모델을 따릅니다.
+    - 동시에 들어온 다른 생성 요청과 묶여 하나의 트랜잭션으로 커밋됩니다.
     """
-    new_item = await run_in_executor(
-            lambda: ItemPeewee.create(name=item.name, price=item.price)
+    [new_id] = await item_write_batcher.submit([item.model_dump()])
+    # 이 id로 캐싱되어 있던 404 결과를 지웁니다.
+    item_cache.invalidate(new_id)
+    return Item(id=new_id, **item.model_dump())
+
+
+# Create Bulk (POST) [{"name": "testuser", "price": 1.0}, ...]
+@app.post("/items/bulk", response_model=List[Item], status_code=status.HTTP_201_CREATED)
+async def create_items_bulk(items: List[ItemBase]):
+    """
+    여러 아이템을 한 번에 생성합니다. create_item과 같은 쓰기 병합 경로를 사용합니다.
+    """
+    if len(items) > BULK_CREATE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {BULK_CREATE_MAX}개까지 생성할 수 있습니다.",
         )
-    return new_item
+    if not items:
+        return []
+
+    rows = [item.model_dump() for item in items]
+    new_ids = await item_write_batcher.submit(rows)
+    item_cache.invalidate(*new_ids)
+    return [Item(id=new_id, **row) for new_id, row in zip(new_ids, rows)]
+
+# 키셋(id 기준) 페이지 조회 - 순수한 CRUD 로직만 포함
+def select_items_page_pure(limit: int, after: Optional[int] = None):
+    """
+    id가 after보다 큰 아이템을 id 순서로 limit개까지 조회합니다.
+    OFFSET 대신 id 인덱스를 타므로 뒤쪽 페이지도 조회 비용이 일정합니다.
+    """
+    query = ItemPeewee.select().order_by(ItemPeewee.id).limit(limit)
+    if after is not None:
+        query = query.where(ItemPeewee.id > after)
+    return list(query)
+
+
+# FastAPI의 JSONResponse와 같은 설정의 인코더 (출력 바이트가 완전히 같아야 합니다)
+_json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+def select_items_page_fast(limit: int, after: Optional[int] = None, ndjson: bool = False):
+    """
+    select_items_page_pure의 빠른 경로입니다.
+    Peewee 모델 객체와 Pydantic 검증을 거치지 않고 .tuples() 결과를 곧바로 JSON 바이트로 만듭니다.
+    필드 순서(name, price, id)와 인코딩 설정이 response_model=List[Item]의 출력과 같습니다.
+    (body, 행 수, 마지막 id)를 반환합니다.
+    """
+    query = (ItemPeewee
+             .select(ItemPeewee.name, ItemPeewee.price, ItemPeewee.id)
+             .order_by(ItemPeewee.id)
+             .limit(limit)
+             .tuples())
+    if after is not None:
+        query = query.where(ItemPeewee.id > after)
+    rows = [{"name": name, "price": price, "id": item_id} for name, price, item_id in query]
+
+    if ndjson:
+        body = "".join(_json_encoder.encode(row) + "\n" for row in rows)
+    else:
+        body = _json_encoder.encode(rows)
+    return body.encode("utf-8"), len(rows), rows[-1]["id"] if rows else None
+
+
+async def stream_items_ndjson(after: Optional[int] = None, fast: bool = False):
+    """
+    STREAM_CHUNK_SIZE 단위로 아이템을 읽어 한 줄에 하나씩 JSON으로 내보냅니다.
+    청크마다 새로 조회하므로 테이블 크기와 상관없이 메모리 사용량이 일정합니다.
+    """
+    last_id = after
+    while True:
+        if fast:
+            chunk, count, last_id = await run_in_executor(
+                db_operation, select_items_page_fast, STREAM_CHUNK_SIZE, last_id, True)
+            if count:
+                yield chunk
+        else:
+            rows = await run_in_executor(db_operation, select_items_page_pure, STREAM_CHUNK_SIZE, last_id)
+            count = len(rows)
+            if rows:
+                # 빠른 경로와 같은 인코더를 씁니다. (model_dump_json은 실수를 1e16처럼 써서 바이트가 달라집니다)
+                yield "".join(_json_encoder.encode(Item.model_validate(row).model_dump(mode="json")) + "\n"
+                              for row in rows)
+                last_id = rows[-1].id
+        if count < STREAM_CHUNK_SIZE:
+            break
+
+
+def items_page_etag(table_version: int, limit: int, after: Optional[int]) -> str:
+    return make_etag("items", table_version, limit, "" if after is None else after)
+
+
+def select_items_page_conditional_pure(select_page, limit: int, after: Optional[int], is_fresh):
+    """
+    테이블 버전으로 목록 ETag를 만들고, 클라이언트 캐시가 최신이면(is_fresh) 목록을 읽지 않습니다.
+    버전과 목록을 같은 트랜잭션에서 읽으므로 둘이 서로 어긋나지 않습니다.
+    (etag, last_modified, 페이지 또는 None)을 반환합니다.
+    """
+    table_version = ItemTableVersion.get_by_id(1)
+    etag = items_page_etag(table_version.version, limit, after)
+    if is_fresh(etag, table_version.updated_at):
+        return etag, table_version.updated_at, None
+    return etag, table_version.updated_at, select_page(limit, after)
 
-# Read All (PATCH)
+
+# Read All (PATCH) - ?limit=100&after=<마지막 id>, ?stream=true 이면 NDJSON 스트리밍
 @app.patch("/items/", response_model=List[Item])
-async def read_items():
+async def read_items(
+    request: Request,
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    after: Optional[int] = Query(None, ge=0),
+    stream: bool = False,
+    fast: bool = False,
+):
     """
-    전체 아이템 목록을 조회합니다.
-    실사용시에는 전체 목록을 제한적으로 조회하도록 합니다.
-    너무 많은 데이터를 로드하다가 서버나 데이터베이스가 불안정해지기도 합니다.
+    아이템 목록을 id 순서로 조회합니다.
+    - limit: 한 페이지의 최대 개수, after: 이전 페이지의 마지막 id (키셋 페이지네이션)
+    - 다음 페이지가 있으면 X-Next-After 헤더에 다음 after 값을 담아 돌려줍니다.
+    - stream=true 이면 after 이후의 전체 목록을 NDJSON(application/x-ndjson)으로 스트리밍합니다.
+    - fast=true 이면 ORM 객체 생성과 행 단위 Pydantic 검증 없이 바로 JSON으로 인코딩합니다.
+    - 테이블 버전 기반 ETag / Last-Modified를 보내고, 바뀐 것이 없으면 목록을 읽지 않고 304로 답합니다.
     """
-    items = await run_in_executor(lambda: list(ItemPeewee.select()))
+    if stream:
+        return StreamingResponse(stream_items_ndjson(after, fast), media_type="application/x-ndjson")
+
+    select_page = select_items_page_fast if fast else select_items_page_pure
+    etag, last_modified, page = await run_in_executor(
+        db_operation, select_items_page_conditional_pure, select_page, limit, after,
+        lambda etag, last_modified: is_not_modified(request, etag, last_modified))
+    headers = validator_headers(etag, last_modified)
+    if page is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if fast:
+        body, count, last_id = page
+        if count == limit:
+            headers["X-Next-After"] = str(last_id)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    items = page
+    if len(items) == limit:
+        headers["X-Next-After"] = str(items[-1].id)
+    response.headers.update(headers)
     return items
 
 
-# Read Single (GET)
-@app.get("/items/{item_id}", response_model=Item)
-async def read_item(item_id: int):
-    # 순수한 CRUD 로직만 포함
-    def get_item_by_id_pure(item_id: int):
-        try:
-            # 연결 및 닫기는 'db_operation'에서 처리하므로 생략
-            return ItemPeewee.get_by_id(item_id)
-        except ItemPeewee.DoesNotExist:
-            return None
+def build_match_expression(q: str, prefix: bool = True) -> str:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 바꿉니다.
+    단어마다 큰따옴표로 감싸 FTS5 연산자로 해석되지 않게 하고, prefix이면 접두어(*) 검색을 합니다.
+    여러 단어는 모두 포함해야 합니다. (AND)
+    """
+    terms = ['"' + term.replace('"', '""') + '"' + ("*" if prefix else "") for term in q.split()]
+    return " ".join(terms)
+
+
+# 이름 검색 - 순수한 CRUD 로직만 포함
+def search_items_pure(match: str, min_price: Optional[float], max_price: Optional[float],
+                      limit: int, order: str = "rank"):
+    """
+    FTS5 색인에서 이름을 찾고 bm25 점수(rank) 또는 최신순(id 역순)으로 정렬합니다.
+    가격 조건은 rowid로 ItemPeewee와 조인해서 거릅니다.
+    rank는 일치하는 모든 행의 점수를 계산하므로, 아주 흔한 단어는 recent가 훨씬 빠릅니다.
+    """
+    ordering = ItemSearchIndex.rank() if order == "rank" else ItemSearchIndex.rowid.desc()
+    query = (ItemPeewee
+             .select(ItemPeewee)
+             .join(ItemSearchIndex, on=(ItemSearchIndex.rowid == ItemPeewee.id))
+             .where(ItemSearchIndex.match(match))
+             .order_by(ordering)
+             .limit(limit))
+    if min_price is not None:
+        query = query.where(ItemPeewee.price >= min_price)
+    if max_price is not None:
+        query = query.where(ItemPeewee.price <= max_price)
+    return list(query)
+
+
+# Search (GET) - /items/search?q=peewee&min_price=10&max_price=50
+# /items/{item_id}보다 먼저 등록해야 "search"가 item_id로 해석되지 않습니다.
+@app.get("/items/search", response_model=List[Item])
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    prefix: bool = True,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    limit: int = Query(SEARCH_LIMIT_DEFAULT, ge=1, le=SEARCH_LIMIT_MAX),
+    order: str = Query("rank", pattern="^(rank|recent)$"),
+):
+    """
+    아이템 이름을 전문 검색(FTS5)합니다.
+    - q: 검색어 (여러 단어는 모두 포함), prefix=true 이면 단어의 앞부분만 맞아도 찾습니다.
+    - min_price / max_price: 가격 범위 조건
+    - order=rank 이면 관련도(bm25) 순, order=recent 이면 최근에 추가된 순으로 정렬됩니다.
+    """
+    match = build_match_expression(q, prefix)
+    if not match:
+        return []
+    return await run_in_executor(db_operation, search_items_pure, match, min_price, max_price, limit, order)
+
+
+# 가격 통계 조회 - 순수한 CRUD 로직만 포함
+def read_price_stats_pure(prefix: Optional[str]):
+    """
+    요약 테이블에서 전체 통계와 (prefix가 있으면) 접두어 통계를 읽습니다.
+    아이템 수와 상관없이 요약 테이블의 몇 행만 읽습니다.
+    """
+    def to_stats(count, total, min_price, max_price):
+        if not count:
+            return PriceStats()
+        return PriceStats(count=count, sum=total, min=min_price, max=max_price, avg=total / count)
+
+    overall = (ItemPriceStats
+               .select(ItemPriceStats.item_count, ItemPriceStats.total,
+                       ItemPriceStats.min_price, ItemPriceStats.max_price)
+               .where((ItemPriceStats.scope == "all") & (ItemPriceStats.prefix == ""))
+               .tuples()
+               .first())
+    result = ItemStats(overall=to_stats(*overall) if overall else PriceStats())
+    if prefix is None:
+        return result
+
+    # 버킷 이름은 SQLite의 lower()로 만들었으므로 비교할 값도 SQLite에서 같은 방식으로 바꿉니다.
+    bucket = peewee.fn.lower(prefix)
+    by_prefix = (ItemPriceStats
+                 .select(peewee.fn.SUM(ItemPriceStats.item_count), peewee.fn.SUM(ItemPriceStats.total),
+                         peewee.fn.MIN(ItemPriceStats.min_price), peewee.fn.MAX(ItemPriceStats.max_price))
+                 .where((ItemPriceStats.scope == "prefix") &
+                        (peewee.fn.substr(ItemPriceStats.prefix, 1, len(prefix)) == bucket))
+                 .tuples()
+                 .get())
+    result.prefix = prefix
+    result.by_prefix = to_stats(*by_prefix)
+    return result
+
+
+# Stats (GET) - /items/stats?prefix=pe
+@app.get("/items/stats", response_model=ItemStats)
+async def read_item_stats(prefix: Optional[str] = Query(None, min_length=1, max_length=STATS_PREFIX_LENGTH)):
+    """
+    아이템 가격의 개수, 합계, 최소, 최대, 평균을 조회합니다.
+    - prefix: 이름 접두어(대소문자 무시, 최대 STATS_PREFIX_LENGTH 글자)별 통계를 함께 조회합니다.
+    - 요약 테이블은 생성/수정/삭제와 같은 트랜잭션에서 증분으로 갱신되므로 전체 집계를 하지 않습니다.
+    """
+    return await run_in_executor(db_operation, read_price_stats_pure, prefix)
+
+
+PRECONDITION_FAILED = object()  # If-Match가 현재 버전과 맞지 않을 때 *_pure 함수가 돌려주는 표식
+
+
+def item_etag(item_id: int, version: int) -> str:
+    return make_etag(item_id, version)
+
+
+def get_item_version_pure(item_id: int):
+    return ItemVersion.get_or_none(ItemVersion.item_id == item_id)
+
+
+def get_item_with_version_pure(item_id: int):
+    """아이템과 버전을 한 번에 읽어 (아이템, 버전, 수정 시각) 또는 None을 반환합니다."""
+    row = (ItemPeewee
+           .select(ItemPeewee, ItemVersion.version, ItemVersion.updated_at)
+           .join(ItemVersion, on=(ItemVersion.item_id == ItemPeewee.id))
+           .where(ItemPeewee.id == item_id)
+           .objects()
+           .first())
+    if row is None:
+        return None
+    return row, row.version, row.updated_at
+
 
-    # run_in_executor를 db_operation과 함께 사용
-    db_item = await run_in_executor(db_operation, get_item_by_id_pure, item_id)
+def check_if_match_pure(item_id: int, if_match: Optional[str]) -> bool:
+    """If-Match가 없거나 현재 버전과 맞으면 True (쓰기 쓰레드의 트랜잭션 안에서 호출)"""
+    if if_match is None:
+        return True
+    current = get_item_version_pure(item_id)
+    # 현재 표현이 없으면 "*"를 포함해 어떤 값과도 맞지 않습니다. (RFC 9110 13.1.1)
+    return current is not None and etag_matches(if_match, item_etag(item_id, current.version), weak=False)
 
-    if db_item is None:
+
+# Read Single (GET)
+@app.get("/items/{item_id}", response_model=Item)
+async def read_item(item_id: int, request: Request, response: Response):
+    # 캐시에 있으면 DB를 거치지 않습니다. (없는 아이템도 잠시 캐싱)
+    cached = item_cache.get(item_id, MISSING)
+    if cached is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
-    return db_item
+    if cached is MISSING:
+        # 조회하는 사이에 수정/삭제가 일어나면 오래된 값을 캐시에 넣지 않도록 버전을 받아 둡니다.
+        cache_version = item_cache.version()
+
+        # 조건부 요청이면 버전만 먼저 확인하고, 바뀌지 않았으면 행을 읽지 않고 304로 답합니다.
+        if has_conditional_headers(request):
+            current = await run_in_executor(db_operation, get_item_version_pure, item_id)
+            if current is None:
+                item_cache.set(item_id, None, ttl=ITEM_CACHE_NEGATIVE_TTL, version=cache_version)
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+            etag = item_etag(item_id, current.version)
+            if is_not_modified(request, etag, current.updated_at):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                                headers=validator_headers(etag, current.updated_at))
+
+        # run_in_executor를 db_operation과 함께 사용
+        found = await run_in_executor(db_operation, get_item_with_version_pure, item_id)
+
+        if found is None:
+            item_cache.set(item_id, None, ttl=ITEM_CACHE_NEGATIVE_TTL, version=cache_version)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+        db_item, version, updated_at = found
+        cached = (Item.model_validate(db_item), version, updated_at)
+        item_cache.set(item_id, cached, version=cache_version)
+
+    item, version, updated_at = cached
+    etag = item_etag(item_id, version)
+    headers = validator_headers(etag, updated_at)
+    if is_not_modified(request, etag, updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return item
 
 
 # Update (PUT) - 부분 수정 (선택적 사용) {"name": "testuser", "price": 2.0}
 @app.put("/items/{item_id}", response_model=Item)
-async def partial_update_item(item_id: int, item_update: ItemUpdate):
+async def partial_update_item(item_id: int, item_update: ItemUpdate, response: Response,
+                              if_match: Optional[str] = Header(None)):
     """
     특정 ID의 아이템 데이터만 수정합니다.
+    - 요청 본문에 포함된(None이 아닌) 필드만 변경합니다.
+    - If-Match 헤더가 있으면 현재 ETag와 같을 때만 수정합니다. (다르면 412)
     """
-    pass
+    changes = item_update.model_dump(exclude_none=True)
+
+    # 순수한 CRUD 로직만 포함
+    def update_item_pure(item_id: int, changes: dict, if_match: Optional[str]):
+        # 확인과 수정이 같은 트랜잭션, 같은 쓰기 쓰레드에서 일어나므로 중간에 끼어드는 쓰기가 없습니다.
+        if not check_if_match_pure(item_id, if_match):
+            return PRECONDITION_FAILED
+        if changes:
+            ItemPeewee.update(**changes).where(ItemPeewee.id == item_id).execute()
+        return get_item_with_version_pure(item_id)
+
+    found = await run_in_executor(db_operation, update_item_pure, item_id, changes, if_match, write=True)
+    item_cache.invalidate(item_id)
+
+    if found is PRECONDITION_FAILED:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Item has been modified")
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    db_item, version, updated_at = found
+    response.headers.update(validator_headers(item_etag(item_id, version), updated_at))
+    return db_item
 
 
 # Delete (DELETE)
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_item(item_id: int):
+async def delete_item(item_id: int, if_match: Optional[str] = Header(None)):
     # 순수한 CRUD 로직만 포함
-    def delete_item_pure(item_id: int):
+    def delete_item_pure(item_id: int, if_match: Optional[str]):
+        if not check_if_match_pure(item_id, if_match):
+            return PRECONDITION_FAILED
         # delete() 쿼리를 실행하고 삭제된 행의 수를 반환
         rows_deleted = ItemPeewee.delete().where(ItemPeewee.id == item_id).execute()
         return rows_deleted
 
-    rows_deleted = await run_in_executor(db_operation, delete_item_pure, item_id)
+    rows_deleted = await run_in_executor(db_operation, delete_item_pure, item_id, if_match, write=True)
+    item_cache.invalidate(item_id)
 
+    if rows_deleted is PRECONDITION_FAILED:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Item has been modified")
     if rows_deleted == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
     """
     특정 ID의 아이템 데이터를 삭제합니다.
+    - If-Match 헤더가 있으면 현재 ETag와 같을 때만 삭제합니다. (다르면 412)
+    """
+    pass
+
+
+@app.get("/health/db")
+async def db_health():
+    """
+    DB 연결 상태와 연결 풀 통계(open, reused, waiting 등)를 확인합니다.
+    """
+    return await run_in_executor(db.health_check)
+
+
+@app.get("/health/executor")
+async def executor_health():
+    """
+    읽기/쓰기 대기열의 깊이, 대기 시간, 거절 횟수를 확인합니다.
+    """
+    return db_executor.stats()
+
+
+@app.get("/health/item-cache")
+async def item_cache_health():
+    """
+    단건 조회 캐시의 크기와 hit / miss / eviction 횟수를 확인합니다.
+    """
+    return item_cache.stats()
+
+
+@app.get("/health/rate-limit")
+async def rate_limit_health():
+    """
+    요청 제한기의 키 수와 허용 / 거절 횟수를 확인합니다.
     """
-    pass
\ No newline at end of file
+    return rate_limiter.stats()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CRUD.py 관리 명령")
+    parser.add_argument("command", choices=["rebuild-search-index", "rebuild-price-stats", "verify-price-stats"])
+    args = parser.parse_args()
+
+    if args.command == "rebuild-search-index":
+        rebuild_search_index()
+        print("검색 색인을 다시 만들었습니다.")
+    elif args.command == "rebuild-price-stats":
+        db_operation(rebuild_price_stats_pure)
+        print("가격 통계 요약 테이블을 다시 만들었습니다.")
+    elif args.command == "verify-price-stats":
+        problems = db_operation(verify_price_stats_pure)
+        for problem in problems:
+            print(problem)
+        print("가격 통계가 전체 집계와 일치합니다." if not problems else f"불일치 {len(problems)}건")
+        raise SystemExit(1 if problems else 0)
@@ -0,0 +1,77 @@
+"""
+CRUD.py 목록 조회(PATCH /items/)의 기본 경로와 빠른 경로(fast=true)의 처리량을 비교합니다.
+임시 DB 파일을 만들어 사용하므로 config.env의 DB에는 영향을 주지 않습니다.
+
+실행: python CRUD벤치마크.py [행 수] [반복 횟수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# CRUD.py를 불러오기 전에 DB 경로를 바꿔 둡니다. (load_dotenv는 이미 있는 환경 변수를 덮어쓰지 않습니다)
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+# 같은 클라이언트가 수백 번 연속으로 요청하므로 IP별 요청 한도를 끕니다.
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+from fastapi.testclient import TestClient
+
+import CRUD
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+PAGE = CRUD.PAGE_SIZE_MAX
+EXPONENT_PRICES = [1e16, 1.5e16, 1e-7, 1.25e-5, 1e22]
+
+
+def fill_table(rows: int):
+    batch = [{"name": f"아이템-{i:07d}", "price": round(1 + i * 0.37, 2)} for i in range(rows)]
+    # 지수 표기로 바뀌는 범위의 가격도 넣어서 두 경로의 실수 출력이 같은지 확인합니다.
+    batch += [{"name": f"지수-{price!r}", "price": price} for price in EXPONENT_PRICES]
+    CRUD.db_operation(CRUD.insert_items_pure, batch)
+
+
+def read_all_pages(client: TestClient, fast: bool) -> list:
+    """X-Next-After를 따라 전체 목록을 끝까지 읽고, 페이지 본문 목록을 반환합니다."""
+    bodies = []
+    after = None
+    while True:
+        params = {"limit": PAGE, "fast": str(fast).lower()}
+        if after is not None:
+            params["after"] = after
+        response = client.patch("/items/", params=params)
+        bodies.append(response.content)
+        after = response.headers.get("x-next-after")
+        if after is None:
+            return bodies
+
+
+def read_stream(client: TestClient, fast: bool) -> bytes:
+    """stream=true로 전체 목록을 NDJSON으로 읽어 본문을 반환합니다."""
+    response = client.patch("/items/", params={"stream": "true", "fast": str(fast).lower()})
+    return response.content
+
+
+def measure(client: TestClient, fast: bool) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        read_all_pages(client, fast)
+        best = min(best, time.perf_counter() - started)
+    return ROWS / best
+
+
+if __name__ == "__main__":
+    fill_table(ROWS)
+    client = TestClient(CRUD.app)
+
+    # 두 경로의 응답이 바이트 단위로 같은지 먼저 확인합니다.
+    assert read_all_pages(client, fast=False) == read_all_pages(client, fast=True), "응답 본문이 다릅니다."
+    assert read_stream(client, fast=False) == read_stream(client, fast=True), "스트리밍 본문이 다릅니다."
+
+    default_rps = measure(client, fast=False)
+    fast_rps = measure(client, fast=True)
+    print(f"행 수: {ROWS:,}, 페이지 크기: {PAGE}, 반복: {ROUNDS}회 (최고 기록)")
+    print(f"기본 경로 (Peewee 모델 + Pydantic): {default_rps:>12,.0f} rows/s")
+    print(f"빠른 경로 (.tuples() + json)      : {fast_rps:>12,.0f} rows/s")
+    print(f"처리량 차이: x{fast_rps / default_rps:.2f}")
@@ -0,0 +1,252 @@
+import glob
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+KST = timezone(timedelta(hours=9))
+
+ACCESS_LOG_QUEUE_SIZE = 10000          # 아직 쓰지 않은 로그를 담아 둘 최대 줄 수
+ACCESS_LOG_BATCH_SIZE = 1000           # 한 번의 write로 묶어서 쓰는 최대 줄 수
+ACCESS_LOG_FLUSH_INTERVAL = 0.5        # 줄이 적게 들어올 때도 이 시간(초)마다 파일에 씁니다.
+ACCESS_LOG_BLOCK_TIMEOUT = 0.05        # block 정책에서 큐 자리를 기다리는 최대 시간 (초)
+ACCESS_LOG_BUFFER_SIZE = 1024 * 1024   # 파일 쓰기 버퍼 크기 (1MB)
+
+_STOP = object()
+
+_stamp_second = None
+_stamp_text = ""
+
+
+def access_log_timestamp(now: float = None) -> str:
+    """
+    액세스 로그용 시간 문자열(예: 23/Dec/2025:10:16:42 +0900)을 만듭니다.
+    같은 초 안에서는 이전에 만든 문자열을 그대로 돌려줍니다.
+    """
+    global _stamp_second, _stamp_text
+    second = int(time.time() if now is None else now)
+    if second != _stamp_second:
+        _stamp_text = datetime.fromtimestamp(second, KST).strftime("%d/%b/%Y:%H:%M:%S %z")
+        _stamp_second = second
+    return _stamp_text
+
+
+_route_paths = {}   # 엔드포인트 함수 -> 경로 템플릿 (/items/{item_id})
+
+
+def route_template(scope) -> str:
+    """
+    요청이 매칭된 라우트의 경로 템플릿(/items/{item_id})을 돌려줍니다.
+    URL 대신 이 값을 지표나 오류 집계의 키로 쓰면 키 수가 URL마다 늘어나지 않습니다.
+    라우트가 없는 요청(404 등)은 "unmatched" 하나로 모읍니다.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    path = _route_paths.get(endpoint)
+    if path is None:
+        for route in getattr(scope.get("app"), "routes", []):
+            if getattr(route, "endpoint", None) is endpoint:
+                path = _route_paths[endpoint] = route.path
+                break
+        else:
+            return scope["path"]
+    return path
+
+
+class BatchedLogWriter:
+    """
+    로그 줄을 큐에 넣기만 하고, 파일 쓰기는 백그라운드 쓰레드가 모아서 한 번에 처리합니다.
+    - write()는 큐에 넣고 바로 돌아오므로 이벤트 루프에서 디스크를 기다리지 않습니다.
+    - 큐가 가득 차면 policy에 따라 버리거나("drop") 잠시 기다립니다("block").
+      block은 이벤트 루프를 멈추므로 block_timeout까지만 기다리고, 그래도 자리가 없으면 버립니다.
+      버린 줄 수는 stats()의 dropped로 확인합니다.
+    - max_bytes를 넘거나 rotate_interval(초)이 지나면 파일 이름 뒤에 시각을 붙여 보관하고
+      새 파일을 엽니다. 보관 파일은 backup_count개까지만 남깁니다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, rotate_interval: float = None,
+                 backup_count: int = 7, policy: str = "drop", queue_size: int = ACCESS_LOG_QUEUE_SIZE,
+                 block_timeout: float = ACCESS_LOG_BLOCK_TIMEOUT):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy는 'drop' 또는 'block'이어야 합니다.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._next_rollover = None
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, line: str):
+        try:
+            if self.policy == "drop":
+                self._queue.put_nowait(line)
+            else:
+                self._queue.put(line, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        """큐에 남은 줄을 모두 쓰고 쓰레드를 멈춥니다."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- 백그라운드 쓰레드 ---
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8", buffering=ACCESS_LOG_BUFFER_SIZE)
+        if self.rotate_interval:
+            self._next_rollover = time.time() + self.rotate_interval
+
+    def _should_rotate(self) -> bool:
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return self._next_rollover is not None and time.time() >= self._next_rollover
+
+    def _rotate(self):
+        # 닫은 뒤에 실패해도 다음 묶음에서 다시 열도록 먼저 비워 둡니다.
+        file, self._file = self._file, None
+        file.close()
+        suffix = datetime.now(KST).strftime("%Y%m%d-%H%M%S")
+        target = f"{self.path}.{suffix}"
+        index = 1
+        while os.path.exists(target):
+            target = f"{self.path}.{suffix}.{index}"
+            index += 1
+        if os.path.exists(self.path):
+            os.rename(self.path, target)
+        backups = sorted(glob.glob(glob.escape(self.path) + ".*"), key=os.path.getmtime)
+        for old in backups[:max(0, len(backups) - self.backup_count)]:
+            os.remove(old)
+        self.rotations += 1
+        self._open()
+
+    def _run(self):
+        # 파일을 열거나 보관하다 실패해도 쓰레드는 멈추지 않고, 다음 묶음을 쓸 때 다시 엽니다.
+        try:
+            self._open()
+        except OSError:
+            self.errors += 1
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=ACCESS_LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                if self._file is not None and self._next_rollover is not None and time.time() >= self._next_rollover:
+                    try:
+                        self._rotate()
+                    except OSError:
+                        self.errors += 1
+                continue
+
+            lines = []
+            item = first
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                lines.append(item)
+                if len(lines) >= ACCESS_LOG_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                try:
+                    if self._file is None:
+                        self._open()
+                    self._file.write("\n".join(lines) + "\n")
+                    self._file.flush()
+                    self.written += len(lines)
+                    self.batches += 1
+                    if self._should_rotate():
+                        self._rotate()
+                except OSError:
+                    self.errors += 1
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "policy": self.policy,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
+
+
+class AccessLogMiddleware:
+    """
+    응답을 모두 보낸 뒤에 액세스 로그 한 줄을 남기는 ASGI 미들웨어입니다.
+    형식: 클라이언트 - - [시간] "메서드 경로 HTTP/버전" 상태 응답바이트 "User-Agent" 처리시간(ms)
+    metrics(RequestMetrics)를 넘기면 같은 값으로 경로별 지표도 함께 모읍니다.
+    """
+
+    def __init__(self, app, writer: BatchedLogWriter, metrics=None):
+        self.app = app
+        self.writer = writer
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timestamp = access_log_timestamp()
+        method = scope["method"]
+        if self.metrics is not None:
+            self.metrics.request_started(method)
+        response = [500, 0]  # 상태 코드, 응답 바이트 (응답 없이 예외가 나면 500으로 기록)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                response[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                response[1] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            duration = time.perf_counter() - started
+            status, size = response
+            client = scope.get("client")
+            user_agent = "-"
+            for name, value in scope["headers"]:
+                if name == b"user-agent":
+                    user_agent = value.decode("latin-1")
+                    break
+            self.writer.write(
+                f'{client[0] if client else "-"} - - [{timestamp}] '
+                f'"{method} {scope["path"]} HTTP/{scope.get("http_version", "1.1")}" '
+                f'{status} {size} "{user_agent}" {duration * 1000:.3f}'
+            )
+            if self.metrics is not None:
+                self.metrics.request_finished(method, route_template(scope), status, size, duration)
@@ -0,0 +1,41 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    "확실히 없음"을 O(1)로 판단하는 확률적 집합입니다.
+    - `key in bloom`이 False이면 key는 절대 추가된 적이 없습니다.
+    - True이면 추가되었을 수도 있으므로 실제 저장소(DB)에서 확인해야 합니다. (오탐률 error_rate)
+    - 삭제는 지원하지 않으므로, 항목이 줄어들면 새 필터를 만들어 교체합니다.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # 128비트 해시 하나를 둘로 나눠 k개의 위치를 만듭니다. (Kirsch-Mitzenmacher 기법)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        """capacity를 넘기면 오탐률이 설계값보다 커집니다."""
+        return self.count > self.capacity
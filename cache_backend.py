@@ -0,0 +1,356 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache.backends import Backend
+
+from db_pool import create_database
+
+CACHE_MAX_BYTES = 64 * 1024 * 1024   # 캐시가 사용할 최대 메모리 (키 + 값 바이트 수 기준, 64MB)
+SINGLE_FLIGHT_TIMEOUT = 10.0         # 다른 요청이 값을 계산하는 동안 기다리는 최대 시간 (초)
+SQLITE_EVICT_TARGET = 0.9            # 용량을 넘으면 max_bytes의 이 비율까지 줄입니다. (매번 조금씩 지우지 않도록)
+SQLITE_EVICT_BATCH = 256             # 용량 초과 시 한 번에 지우는 행 수
+NO_EXPIRY = 1e18                     # 만료 시간이 없는 항목의 expires_at 값
+
+
+class _Entry:
+    __slots__ = ("data", "expires_at", "size", "freq")
+
+    def __init__(self, data: bytes, expires_at: Optional[float], size: int):
+        self.data = data
+        self.expires_at = expires_at
+        self.size = size
+        self.freq = 1
+
+
+class BoundedMemoryBackend(Backend):
+    """
+    fastapi-cache2의 InMemoryBackend를 대신하는 메모리 캐시 백엔드입니다.
+    - 키와 값의 바이트 수 합계가 max_bytes를 넘지 않도록 LRU 또는 LFU로 항목을 버립니다.
+    - 같은 키에 대한 캐시 미스가 동시에 들어오면 첫 요청만 값을 계산하고(single-flight),
+      나머지는 그 요청이 set()할 때까지 기다렸다가 같은 값을 받습니다.
+      계산하던 요청이 실패하면 기다리던 요청 중 하나가 이어서 계산합니다.
+    - 모든 메서드는 이벤트 루프 쓰레드에서만 실행되므로 잠금 없이 동작합니다.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, policy: str = "lru",
+                 single_flight_timeout: float = SINGLE_FLIGHT_TIMEOUT):
+        if policy not in ("lru", "lfu"):
+            raise ValueError("policy는 'lru' 또는 'lfu'여야 합니다.")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.single_flight_timeout = single_flight_timeout
+        self._entries = OrderedDict()   # key -> _Entry (LRU 순서)
+        self._freq_keys = {}            # LFU: 사용 횟수 -> 그 횟수의 키들 (오래된 순)
+        self._min_freq = 1
+        self._inflight = {}             # key -> 값을 기다리는 Future
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.coalesced = 0              # 다른 요청의 계산을 기다린 횟수
+        self.coalesced_timeouts = 0     # 기다리다 시간 초과로 직접 계산한 횟수
+        self.rejected = 0               # max_bytes보다 커서 저장하지 않은 값
+
+    # --- 내부: 저장소 관리 ---
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expired += 1
+            return None
+        self._touch(key, entry)
+        return entry
+
+    def _touch(self, key: str, entry: _Entry):
+        if self.policy == "lru":
+            self._entries.move_to_end(key)
+            return
+        bucket = self._freq_keys[entry.freq]
+        del bucket[key]
+        if not bucket:
+            del self._freq_keys[entry.freq]
+            if self._min_freq == entry.freq:
+                self._min_freq = entry.freq + 1
+        entry.freq += 1
+        self._freq_keys.setdefault(entry.freq, OrderedDict())[key] = None
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        if self.policy == "lfu":
+            bucket = self._freq_keys[entry.freq]
+            del bucket[key]
+            if not bucket:
+                del self._freq_keys[entry.freq]
+
+    def _victim(self) -> str:
+        if self.policy == "lru":
+            return next(iter(self._entries))
+        if self._min_freq not in self._freq_keys:
+            self._min_freq = min(self._freq_keys)
+        return next(iter(self._freq_keys[self._min_freq]))
+
+    def _release(self, key: str, future: asyncio.Future, value: Optional[bytes] = None):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.done():
+            future.set_result(value)
+
+    def _ttl(self, entry: _Entry) -> int:
+        if entry.expires_at is None:
+            return 0
+        return max(0, math.ceil(entry.expires_at - time.monotonic()))
+
+    # --- Backend 인터페이스 ---
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        # 조회 한 번은 hits와 misses 중 하나로만 셉니다. 기다려서 받은 값도 계산하지 않았으므로 hit입니다.
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return self._ttl(entry), entry.data
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            # 이미 다른 요청이 계산 중이면 그 결과를 기다립니다.
+            self.coalesced += 1
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self.single_flight_timeout)
+            except asyncio.TimeoutError:
+                self.coalesced_timeouts += 1
+                self.misses += 1
+                return 0, None
+
+        # 이 요청이 값을 계산합니다. set()이 불리거나 요청이 끝나면 기다리던 요청들을 깨웁니다.
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        task = asyncio.current_task()
+        if task is not None:
+            task.add_done_callback(lambda _: self._release(key, future))
+        return 0, None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.data
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        size = len(key) + len(value)
+        future = self._inflight.get(key)
+        if size > self.max_bytes:
+            self.rejected += 1
+        else:
+            while self.bytes + size > self.max_bytes:
+                self._remove(self._victim())
+                self.evictions += 1
+            expires_at = time.monotonic() + expire if expire else None
+            self._entries[key] = _Entry(value, expires_at, size)
+            self.bytes += size
+            if self.policy == "lfu":
+                self._freq_keys.setdefault(1, OrderedDict())[key] = None
+                self._min_freq = 1
+
+        if future is not None:
+            self._release(key, future, value)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            keys = [k for k in self._entries if k.startswith(namespace)]
+        elif key:
+            keys = [key] if key in self._entries else []
+        else:
+            keys = list(self._entries)
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+            "coalesced_timeouts": self.coalesced_timeouts,
+            "inflight": len(self._inflight),
+        }
+
+
+# 공유 캐시 파일의 스키마
+# - cache_usage.total_bytes는 트리거로 갱신하므로, 용량 확인에 전체 합계를 구할 필요가 없습니다.
+# - 덮어쓰기는 UPSERT(ON CONFLICT DO UPDATE)로 하므로 UPDATE 트리거가 실행됩니다.
+#   (INSERT OR REPLACE는 recursive_triggers 없이는 DELETE 트리거가 실행되지 않습니다)
+SQLITE_CACHE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS cache_entry (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS cache_entry_expires_at ON cache_entry (expires_at)",
+    "CREATE TABLE IF NOT EXISTS cache_usage (id INTEGER PRIMARY KEY CHECK (id = 1), total_bytes INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO cache_usage (id, total_bytes) VALUES (1, 0)",
+    """CREATE TRIGGER IF NOT EXISTS cache_entry_ai AFTER INSERT ON cache_entry BEGIN
+        UPDATE cache_usage SET total_bytes = total_bytes + NEW.size WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cache_entry_ad AFTER DELETE ON cache_entry BEGIN
+        UPDATE cache_usage SET total_bytes = total_bytes - OLD.size WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cache_entry_au AFTER UPDATE ON cache_entry BEGIN
+        UPDATE cache_usage SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 1;
+    END""",
+]
+
+
+class SqliteCacheBackend(Backend):
+    """
+    같은 서버의 여러 워커 프로세스(uvicorn --workers N)가 함께 쓰는 캐시 백엔드입니다.
+    WAL 모드 SQLite 파일 하나에 저장하므로 Redis 없이도 한 워커가 계산한 값을 다른 워커가 재사용합니다.
+    - 읽기는 WAL 모드에서 쓰기에 막히지 않고 페이지 캐시/mmap에서 끝나므로 이벤트 루프에서 바로 실행합니다.
+    - 쓰기는 다른 프로세스의 쓰기 잠금을 기다릴 수 있으므로 쓰레드 풀에서 실행합니다.
+    - 만료된 행은 읽을 때 무시하고, 용량(max_bytes)을 넘으면 만료된 행부터,
+      그다음 만료가 가까운 행부터 지웁니다. (읽을 때마다 쓰기를 하지 않도록 LRU 대신 만료 순서를 씁니다)
+    hit / miss 횟수는 프로세스별로 집계합니다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.db = create_database(path)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self.db.connection_context():
+            with self.db.atomic():
+                for statement in SQLITE_CACHE_SCHEMA:
+                    self.db.execute_sql(statement)
+
+    def _read(self, key: str):
+        # 조회는 이벤트 루프 쓰레드에서만 하므로, 그 쓰레드의 연결을 반납하지 않고 계속 씁니다.
+        # (조회마다 풀에서 꺼내면 상태 확인 쿼리가 한 번 더 실행됩니다)
+        return self.db.execute_sql(
+            "SELECT value, expires_at FROM cache_entry WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+
+    def _write(self, key: str, value: bytes, expire: Optional[int]):
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.time() + expire if expire else NO_EXPIRY
+        with self.db.connection_context():
+            # 다른 프로세스와 쓰기가 겹쳐도 잠금 승격 실패(SQLITE_BUSY)가 나지 않도록 처음부터 쓰기 잠금을 잡습니다.
+            with self.db.atomic("IMMEDIATE"):
+                self.db.execute_sql(
+                    "INSERT INTO cache_entry (key, value, expires_at, size) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                    "expires_at = excluded.expires_at, size = excluded.size",
+                    (key, value, expires_at, size),
+                )
+                if self._total_bytes() > self.max_bytes:
+                    self._evict()
+
+    def _total_bytes(self) -> int:
+        return self.db.execute_sql("SELECT total_bytes FROM cache_usage WHERE id = 1").fetchone()[0]
+
+    def _evict(self):
+        target = int(self.max_bytes * SQLITE_EVICT_TARGET)
+        cursor = self.db.execute_sql("DELETE FROM cache_entry WHERE expires_at <= ?", (time.time(),))
+        self.evictions += cursor.rowcount
+        excess = self._total_bytes() - target
+        while excess > 0:
+            # 만료가 가까운 행부터, 넘친 바이트 수를 채울 만큼만 골라서 지웁니다.
+            rows = self.db.execute_sql(
+                "SELECT key, size FROM cache_entry ORDER BY expires_at LIMIT ?", (SQLITE_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for victim, size in rows:
+                victims.append(victim)
+                excess -= size
+                if excess <= 0:
+                    break
+            self.db.execute_sql(
+                "DELETE FROM cache_entry WHERE key IN (%s)" % ", ".join("?" * len(victims)), victims)
+            self.evictions += len(victims)
+
+    def _clear(self, namespace: Optional[str], key: Optional[str]) -> int:
+        with self.db.connection_context():
+            with self.db.atomic("IMMEDIATE"):
+                if namespace:
+                    # LIKE 대신 범위 조건을 써서 기본 키 인덱스로 찾습니다.
+                    cursor = self.db.execute_sql(
+                        "DELETE FROM cache_entry WHERE key >= ? AND key < ?", (namespace, namespace + "\uffff"))
+                elif key:
+                    cursor = self.db.execute_sql("DELETE FROM cache_entry WHERE key = ?", (key,))
+                else:
+                    cursor = self.db.execute_sql("DELETE FROM cache_entry")
+                return cursor.rowcount
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        row = self._read(key)
+        if row is None:
+            self.misses += 1
+            return 0, None
+        self.hits += 1
+        value, expires_at = row
+        ttl = 0 if expires_at >= NO_EXPIRY else max(0, math.ceil(expires_at - time.time()))
+        return ttl, bytes(value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _, value = await self.get_with_ttl(key)
+        return value
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await run_in_threadpool(self._write, key, value, expire)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        return await run_in_threadpool(self._clear, namespace, key)
+
+    def purge_expired(self) -> int:
+        """만료된 행을 지웁니다. (주기 작업이나 관리 명령에서 사용)"""
+        with self.db.connection_context():
+            with self.db.atomic("IMMEDIATE"):
+                return self.db.execute_sql(
+                    "DELETE FROM cache_entry WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> dict:
+        entries = self.db.execute_sql("SELECT COUNT(*) FROM cache_entry").fetchone()[0]
+        total_bytes = self._total_bytes()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        self.db.close_all()
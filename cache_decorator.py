@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import math
+import time
+from functools import wraps
+from inspect import Parameter, iscoroutinefunction
+from typing import Optional, Type
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.dependencies.utils import get_typed_return_annotation, get_typed_signature
+from fastapi_cache import FastAPICache
+from fastapi_cache.coder import Coder
+from fastapi_cache.decorator import cache as fastapi_cache
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드에서 갱신 중인 캐시 키 (같은 키를 동시에 여러 번 갱신하지 않도록)
+_refreshing = set()
+# 실행 중인 갱신 작업 (가비지 컬렉션으로 사라지지 않도록 참조를 유지합니다)
+_refresh_tasks = set()
+
+
+def _encode_entry(fresh_until: float, payload: bytes) -> bytes:
+    return b"%.3f\n" % fresh_until + payload
+
+
+def _decode_entry(data: bytes):
+    fresh_until, _, payload = data.partition(b"\n")
+    return float(fresh_until), payload
+
+
+def _cache_control(max_age: int, stale_while_revalidate: int, stale_if_error: int) -> str:
+    parts = [f"max-age={max(0, max_age)}"]
+    if stale_while_revalidate:
+        parts.append(f"stale-while-revalidate={stale_while_revalidate}")
+    if stale_if_error:
+        parts.append(f"stale-if-error={stale_if_error}")
+    return ", ".join(parts)
+
+
+def cache(expire: Optional[int] = None, stale_while_revalidate: int = 0, stale_if_error: int = 0,
+          coder: Optional[Type[Coder]] = None, key_builder=None, namespace: str = ""):
+    """
+    fastapi-cache2의 @cache에 만료 후 유예 시간을 더한 데코레이터입니다.
+    - expire가 지난 뒤 stale_while_revalidate초 동안은 오래된 값을 바로 응답하고,
+      백그라운드 작업 하나가 값을 다시 계산합니다. (첫 요청도 기다리지 않습니다)
+    - stale_if_error초 안에서는 다시 계산하다 예외가 나면 오래된 값을 계속 응답합니다.
+    - Cache-Control 헤더에 두 유예 시간을 함께 보냅니다. (RFC 5861)
+    두 값이 모두 0이면 fastapi-cache2의 @cache를 그대로 사용합니다.
+
+    백그라운드 갱신은 갱신을 일으킨 요청의 인자로 함수를 다시 호출하므로,
+    요청이 끝나면 닫히는 의존성(DB 세션 등)을 인자로 받는 함수에는 쓰지 마세요.
+    """
+    if not stale_while_revalidate and not stale_if_error:
+        return fastapi_cache(expire=expire, coder=coder, key_builder=key_builder, namespace=namespace)
+
+    request_param = Parameter("__cache_request", Parameter.KEYWORD_ONLY, annotation=Request)
+    response_param = Parameter("__cache_response", Parameter.KEYWORD_ONLY, annotation=Response)
+
+    def wrapper(func):
+        signature = get_typed_signature(func)
+        return_type = get_typed_return_annotation(func)
+
+        async def call(args, kwargs):
+            if iscoroutinefunction(func):
+                return await func(*args, **kwargs)
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        async def compute_and_store(backend, key, args, kwargs, ttl, used_coder):
+            result = await call(args, kwargs)
+            payload = used_coder.encode(result)
+            try:
+                # 유예 시간이 끝날 때까지 백엔드에 남겨 둡니다.
+                await backend.set(key, _encode_entry(time.time() + ttl, payload),
+                                  ttl + max(stale_while_revalidate, stale_if_error))
+            except Exception:
+                logger.warning("캐시 저장 실패: %s", key, exc_info=True)
+            return result
+
+        async def refresh_in_background(backend, key, args, kwargs, ttl, used_coder):
+            try:
+                await compute_and_store(backend, key, args, kwargs, ttl, used_coder)
+            except Exception:
+                logger.warning("캐시 백그라운드 갱신 실패, 오래된 값을 유지합니다: %s", key, exc_info=True)
+            finally:
+                _refreshing.discard(key)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Request = kwargs.pop(request_param.name)
+            response: Response = kwargs.pop(response_param.name)
+
+            if not FastAPICache.get_enable() or request.method != "GET" \
+                    or request.headers.get("Cache-Control") == "no-store":
+                return await call(args, kwargs)
+
+            ttl = expire or FastAPICache.get_expire()
+            used_coder = coder or FastAPICache.get_coder()
+            backend = FastAPICache.get_backend()
+            status_header = FastAPICache.get_cache_status_header()
+            build_key = key_builder or FastAPICache.get_key_builder()
+            key = build_key(func, f"{FastAPICache.get_prefix()}:{namespace}",
+                            request=request, response=response, args=args, kwargs=kwargs)
+            if asyncio.iscoroutine(key):
+                key = await key
+
+            try:
+                _, cached = await backend.get_with_ttl(key)
+            except Exception:
+                logger.warning("캐시 조회 실패: %s", key, exc_info=True)
+                cached = None
+
+            now = time.time()
+            if cached is None:
+                result = await compute_and_store(backend, key, args, kwargs, ttl, used_coder)
+                response.headers["Cache-Control"] = _cache_control(ttl, stale_while_revalidate, stale_if_error)
+                response.headers[status_header] = "MISS"
+                return result
+
+            fresh_until, payload = _decode_entry(cached)
+            age_over = now - fresh_until
+            if age_over < 0:
+                state = "HIT"
+            elif age_over < stale_while_revalidate:
+                # 오래된 값을 바로 응답하고, 갱신은 한 번만 백그라운드에서 실행합니다.
+                state = "STALE"
+                if key not in _refreshing:
+                    _refreshing.add(key)
+                    task = asyncio.create_task(
+                        refresh_in_background(backend, key, args, kwargs, ttl, used_coder))
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+            else:
+                # stale-if-error 구간: 직접 다시 계산하고, 실패하면 오래된 값을 응답합니다.
+                try:
+                    result = await compute_and_store(backend, key, args, kwargs, ttl, used_coder)
+                except Exception:
+                    if age_over >= stale_if_error:
+                        raise
+                    logger.warning("캐시 갱신 실패, 오래된 값을 응답합니다: %s", key, exc_info=True)
+                    state = "STALE-IF-ERROR"
+                else:
+                    response.headers["Cache-Control"] = _cache_control(ttl, stale_while_revalidate, stale_if_error)
+                    response.headers[status_header] = "MISS"
+                    return result
+
+            response.headers["Cache-Control"] = _cache_control(
+                math.ceil(fresh_until - now), stale_while_revalidate, stale_if_error)
+            response.headers[status_header] = state
+            return used_coder.decode_as_type(payload, type_=return_type)
+
+        # FastAPI가 Request/Response를 넣어 주도록 시그니처에 추가합니다.
+        parameters = list(signature.parameters.values())
+        inner.__signature__ = signature.replace(parameters=[*parameters, request_param, response_param])
+        return inner
+
+    return wrapper
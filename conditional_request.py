@@ -0,0 +1,61 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """버전 정보로 강한(strong) ETag 값을 만듭니다. 예: "12-345" """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def http_date(timestamp: float) -> str:
+    """Last-Modified 헤더 형식(RFC 7231)의 날짜 문자열을 만듭니다."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    If-None-Match / If-Match 헤더 값에 etag가 들어 있는지 확인합니다.
+    - "*"는 현재 표현이 있으면 항상 일치합니다.
+    - weak=True 이면 W/ 접두어를 무시하고 비교합니다. (If-None-Match는 약한 비교)
+    """
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """
+    조건부 GET 요청에 304로 답해도 되는지 판단합니다.
+    If-None-Match가 있으면 그것만 보고, 없을 때만 If-Modified-Since를 봅니다. (RFC 9110 13.2.2)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP 날짜는 초 단위이므로 초 단위로 잘라서 비교합니다.
+        return int(last_modified) <= since
+    return False
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def validator_headers(etag: str, last_modified: float) -> dict:
+    return {"ETag": etag, "Last-Modified": http_date(last_modified)}
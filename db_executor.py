@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+READER_THREADS = 8          # 읽기 전용 쓰레드 수
+READ_QUEUE_SIZE = 256       # 읽기 쓰레드가 모두 바쁠 때 대기시킬 수 있는 최대 작업 수
+WRITE_QUEUE_SIZE = 512      # 쓰기 쓰레드(1개) 앞에 대기시킬 수 있는 최대 작업 수
+RETRY_AFTER_SEC = 1         # 큐가 가득 찼을 때 클라이언트에게 알려줄 재시도 대기 시간
+
+
+class ExecutorBusyError(Exception):
+    """큐가 가득 차서 작업을 받을 수 없을 때 발생합니다. (HTTP 503 + Retry-After로 변환)"""
+
+    def __init__(self, lane: str, retry_after: int = RETRY_AFTER_SEC):
+        super().__init__(f"DB {lane} queue is full")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class _Lane:
+    """
+    고정된 수의 쓰레드와 크기가 제한된 대기열을 가진 실행 통로입니다.
+    대기열이 가득 차면 작업을 쌓지 않고 ExecutorBusyError로 바로 거절합니다.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"db-{name}")
+        self._lock = threading.Lock()
+        self._pending = 0        # 대기 중 + 실행 중인 작업 수
+        self._running = 0
+        self._max_depth = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def submit(self, func, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._rejected += 1
+                raise ExecutorBusyError(self.name)
+            self._pending += 1
+            self._submitted += 1
+            self._max_depth = max(self._max_depth, self._pending - self._running)
+
+        enqueued = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - enqueued
+            with self._lock:
+                self._running += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._pool.submit(task)
+        # 실행 전에 취소된 작업도 대기열에서 빠지도록 완료 콜백에서 개수를 줄입니다.
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "depth": self._pending - self._running,
+                "running": self._running,
+                "max_depth": self._max_depth,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "wait_avg_ms": round(self._wait_total / started * 1000, 3) if started else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+class DBExecutor:
+    """
+    SQLite용 단일 쓰기 / 다중 읽기 실행기입니다.
+    - 쓰기는 전용 쓰레드 1개에서 순서대로 실행되므로 쓰기끼리 DB 잠금을 두고 다투지 않습니다.
+    - 읽기는 별도의 쓰레드 풀에서 실행되어 쓰기 대기(SQLITE_BUSY)에 막히지 않습니다. (WAL 모드)
+    - 각 대기열의 깊이와 대기 시간을 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(self, readers: int = READER_THREADS,
+                 read_queue_size: int = READ_QUEUE_SIZE,
+                 write_queue_size: int = WRITE_QUEUE_SIZE):
+        self.reader = _Lane("read", readers, read_queue_size)
+        self.writer = _Lane("write", 1, write_queue_size)
+
+    async def read(self, func, *args):
+        return await self.reader.submit(func, *args)
+
+    async def write(self, func, *args):
+        return await self.writer.submit(func, *args)
+
+    def stats(self) -> dict:
+        return {"read": self.reader.stats(), "write": self.writer.stats()}
+
+    def shutdown(self, wait: bool = True):
+        self.writer.shutdown(wait)
+        self.reader.shutdown(wait)
@@ -0,0 +1,168 @@
+import heapq
+import threading
+import time
+
+from playhouse.pool import PooledDatabase, PooledSqliteDatabase, PoolConnection, MaxConnectionsExceeded
+
+# SQLite 기본 튜닝 값
+# - journal_mode=wal: 읽기와 쓰기가 서로를 막지 않습니다.
+# - synchronous=normal: WAL 모드에서는 커밋마다 fsync 하지 않아도 안전합니다.
+# - cache_size: 음수는 KiB 단위 (-64000 = 약 64MB 페이지 캐시)
+# - mmap_size: 읽기를 메모리 맵으로 처리하여 시스템 콜을 줄입니다.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "foreign_keys": 1,
+    "busy_timeout": 5000,
+}
+
+MAX_CONNECTIONS = 32        # 동시에 열 수 있는 최대 연결 수
+WAIT_TIMEOUT = 10           # 연결이 모두 사용 중일 때 기다리는 최대 시간 (초)
+STALE_TIMEOUT = 60 * 60     # 이 시간(초)보다 오래된 연결은 닫고 새로 엽니다.
+
+
+class ManagedSqliteDatabase(PooledSqliteDatabase):
+    """
+    작업 쓰레드마다 하나의 SQLite 연결을 재사용하는 연결 관리자입니다.
+    - `with db:` / `db.close()`는 실제 연결을 닫지 않고 풀에 반납합니다.
+    - 같은 쓰레드가 다시 연결하면 직전에 쓰던 연결을 우선해서 돌려받습니다.
+    - 풀에서 꺼낼 때 `SELECT 1`로 상태를 확인하고, 깨진 연결은 버립니다.
+    - 새로 연 연결 / 재사용한 연결 / 대기 중인 쓰레드 수를 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(self, database, **kwargs):
+        self._affinity = threading.local()
+        self._available = threading.Condition(threading.Lock())
+        self._known_keys = set()
+        self._opened = 0
+        self._reused = 0
+        self._waiting = 0
+        self._waited = 0
+        self._released = 0      # 연결이 반납될 때마다 늘어납니다. (기다리는 쪽이 알림을 놓치지 않도록)
+        super().__init__(database, **kwargs)
+
+    def connect(self, reuse_if_open=False):
+        """연결이 모두 사용 중이면 반납될 때까지 (최대 WAIT_TIMEOUT초) 기다립니다."""
+        deadline = time.monotonic() + (self._wait_timeout or 0)
+        counted = False
+        try:
+            while True:
+                # 꺼내기 전에 반납 횟수를 기억해 두면, 꺼내기에 실패한 직후 ~ wait 사이에 반납된 연결도 놓치지 않습니다.
+                with self._available:
+                    seen = self._released
+                try:
+                    # PooledDatabase.connect의 0.1초 폴링 대신 반납 알림(Condition)으로 기다립니다.
+                    return super(PooledDatabase, self).connect(reuse_if_open)
+                except MaxConnectionsExceeded:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise MaxConnectionsExceeded(
+                            "Max connections exceeded, timed out attempting to connect.")
+                    with self._available:
+                        if not counted:
+                            counted = True
+                            self._waiting += 1
+                            self._waited += 1
+                        self._available.wait_for(lambda: self._released != seen, remaining)
+        finally:
+            if counted:
+                with self._available:
+                    self._waiting -= 1
+
+    def _connect(self):
+        with self._pool_lock:
+            conn = self._checkout_preferred()
+            if conn is None:
+                conn = super()._connect()
+            key = self.conn_key(conn)
+            if key in self._known_keys:
+                self._reused += 1
+            else:
+                self._known_keys.add(key)
+                self._opened += 1
+            return conn
+
+    def _checkout_preferred(self):
+        """이 쓰레드가 직전에 반납한 연결이 풀에 남아 있으면 그 연결을 꺼냅니다."""
+        key = getattr(self._affinity, "key", None)
+        if key is None:
+            return None
+        for index, (timestamp, _, conn) in enumerate(self._connections):
+            if self.conn_key(conn) == key:
+                break
+        else:
+            return None
+
+        self._connections.pop(index)
+        heapq.heapify(self._connections)
+        if self._is_closed(conn) or (self._stale_timeout and self._is_stale(timestamp)):
+            self._close(conn, close_conn=True)
+            return None
+        self._in_use[key] = PoolConnection(timestamp, conn, time.time())
+        return conn
+
+    def _close(self, conn, close_conn=False):
+        with self._pool_lock:
+            key = self.conn_key(conn)
+            if close_conn:
+                self._known_keys.discard(key)
+            else:
+                self._affinity.key = key
+            super()._close(conn, close_conn)
+        with self._available:
+            self._released += 1
+            self._available.notify()
+
+    def _is_closed(self, conn):
+        # 풀에서 꺼낼 때마다 하는 가벼운 상태 확인
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except Exception:
+            # 깨진 연결은 버려지므로, 같은 id를 받은 새 연결이 재사용으로 세어지지 않게 지웁니다.
+            self._known_keys.discard(self.conn_key(conn))
+            return True
+        return False
+
+    def health_check(self) -> dict:
+        """연결을 하나 빌려 간단한 쿼리와 현재 PRAGMA 값을 확인합니다."""
+        try:
+            with self.connection_context():
+                self.execute_sql("SELECT 1").fetchone()
+                journal_mode = self.execute_sql("PRAGMA journal_mode").fetchone()[0]
+        except Exception as e:
+            return {"ok": False, "error": str(e), **self.stats()}
+        return {"ok": True, "journal_mode": journal_mode, **self.stats()}
+
+    def stats(self) -> dict:
+        """open: 열려 있는 연결 수, in_use: 사용 중, idle: 풀에서 대기 중인 연결 수"""
+        with self._pool_lock:
+            in_use = len(self._in_use)
+            idle = len(self._connections)
+            opened = self._opened
+            reused = self._reused
+        with self._available:
+            waiting = self._waiting
+            waited = self._waited
+        return {
+            "open": in_use + idle,
+            "in_use": in_use,
+            "idle": idle,
+            "opened_total": opened,
+            "reused_total": reused,
+            "waiting": waiting,
+            "waited_total": waited,
+        }
+
+
+def create_database(name: str, pragmas: dict = None, **kwargs) -> ManagedSqliteDatabase:
+    """
+    WAL 모드와 튜닝된 PRAGMA가 적용된 연결 관리자를 만듭니다.
+    풀의 연결은 여러 쓰레드를 옮겨 다니므로 check_same_thread=False가 필요합니다.
+    """
+    kwargs.setdefault("max_connections", MAX_CONNECTIONS)
+    kwargs.setdefault("timeout", WAIT_TIMEOUT)
+    kwargs.setdefault("stale_timeout", STALE_TIMEOUT)
+    kwargs.setdefault("check_same_thread", False)
+    return ManagedSqliteDatabase(name, pragmas={**DEFAULT_PRAGMAS, **(pragmas or {})}, **kwargs)
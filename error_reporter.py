@@ -0,0 +1,103 @@
+import asyncio
+import json
+import re
+import threading
+
+from access_log import access_log_timestamp
+
+ERROR_REPORT_INTERVAL = 10.0      # 요약 기록을 남기는 간격 (초) - 간격마다 최대 한 건만 남깁니다.
+ERROR_REPORT_TOP = 20             # 요약 기록 한 건에 담는 최대 오류 종류 수 (많이 난 순서)
+ERROR_MAX_KEYS = 1000             # 집계할 최대 오류 종류 수 (넘치면 overflow로만 셉니다)
+ERROR_SAMPLE_LENGTH = 200         # 보관할 예시 메시지 최대 길이
+
+# 메시지에서 요청마다 달라지는 값(따옴표 안 문자열, 숫자, 16진수)을 지워서 같은 종류의 오류로 묶습니다.
+_FINGERPRINT_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|0x[0-9a-fA-F]+|[0-9a-fA-F]{8,}|\d+(?:\.\d+)?")
+
+
+def fingerprint(message: str) -> str:
+    """'user 42 not found' 와 'user 7 not found'가 같은 값이 되도록 메시지를 정규화합니다."""
+    return _FINGERPRINT_PATTERN.sub("<v>", message[:ERROR_SAMPLE_LENGTH])
+
+
+class ErrorAggregator:
+    """
+    오류를 (오류 타입, 경로, 메시지 지문)별로 메모리에서 세기만 하고, interval마다 요약 한 건을 sink에 넘깁니다.
+    - record()는 딕셔너리 갱신뿐이므로 오류가 쏟아져도 요청 처리 비용이 거의 늘지 않습니다.
+    - sink는 write(line)만 있으면 되며, 이벤트 루프를 막지 않도록 BatchedLogWriter처럼 큐에 넣고 바로
+      돌아오는 것을 넘겨야 합니다.
+    - 종류 수는 max_keys까지만 늘어나고, 그 뒤의 새 종류는 overflow로만 셉니다. (메모리 상한)
+    """
+
+    def __init__(self, sink, interval: float = ERROR_REPORT_INTERVAL, top: int = ERROR_REPORT_TOP,
+                 max_keys: int = ERROR_MAX_KEYS):
+        self.sink = sink
+        self.interval = interval
+        self.top = top
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._pending = {}       # 이번 간격: 키 -> [횟수, 예시 메시지]
+        self._totals = {}        # 시작 후 누적: 키 -> 횟수
+        self.total = 0
+        self.overflow = 0
+        self.reports = 0
+
+    def record(self, error_type: str, route: str, message: str):
+        key = (error_type, route, fingerprint(message))
+        with self._lock:
+            self.total += 1
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[0] += 1
+            elif len(self._pending) < self.max_keys:
+                self._pending[key] = [1, message[:ERROR_SAMPLE_LENGTH]]
+            else:
+                self.overflow += 1
+                return
+            if key in self._totals or len(self._totals) < self.max_keys:
+                self._totals[key] = self._totals.get(key, 0) + 1
+
+    def flush(self):
+        """이번 간격에 모은 오류를 요약 한 건으로 sink에 넘깁니다. 오류가 없었으면 아무것도 남기지 않습니다."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            overflow, self.overflow = self.overflow, 0
+        if not pending and not overflow:
+            return
+        ranked = sorted(pending.items(), key=lambda item: item[1][0], reverse=True)
+        errors = [
+            {"type": error_type, "route": route, "fingerprint": fp, "count": count, "sample": sample}
+            for (error_type, route, fp), (count, sample) in ranked[:self.top]
+        ]
+        omitted = sum(count for _, (count, _) in ranked[self.top:])
+        self.sink.write(json.dumps({
+            "time": access_log_timestamp(),
+            "interval": self.interval,
+            "count": sum(count for count, _ in pending.values()) + overflow,
+            "errors": errors,
+            "omitted": omitted,
+            "overflow": overflow,
+        }, ensure_ascii=False))
+        self.reports += 1
+
+    async def run(self):
+        """interval마다 flush()를 호출합니다. 시작 이벤트에서 태스크로 띄우고, 종료 시 취소한 뒤 flush()합니다."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            totals = sorted(self._totals.items(), key=lambda item: item[1], reverse=True)
+            pending = sum(count for count, _ in self._pending.values())
+            overflow = self.overflow
+        return {
+            "total": self.total,
+            "pending": pending,
+            "overflow": overflow,
+            "reports": self.reports,
+            "errors": [
+                {"type": error_type, "route": route, "fingerprint": fp, "count": count}
+                for (error_type, route, fp), count in totals
+            ],
+        }
+
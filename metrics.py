@@ -0,0 +1,119 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# 요청 처리 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Accumulator:
+    """쓰레드 하나가 혼자 갱신하는 집계 값입니다. (잠금 없이 갱신합니다)"""
+
+    def __init__(self, bucket_count: int):
+        self.bucket_count = bucket_count
+        self.requests = defaultdict(int)        # (method, route, status) -> 요청 수
+        self.response_bytes = defaultdict(int)  # (method, route) -> 응답 바이트 합계
+        self.histograms = {}                    # (method, route) -> [구간별 개수..., 합계, 개수]
+        self.in_flight = defaultdict(int)       # method -> 처리 중인 요청 수
+
+
+class RequestMetrics:
+    """
+    경로(route)별 요청 수, 상태 코드, 응답 크기, 처리 시간 히스토그램과 처리 중인 요청 수를 모읍니다.
+    - 쓰레드마다 따로 집계하고(threading.local) /metrics를 읽을 때만 합치므로, 요청 처리 중에는 잠금이 없습니다.
+    - route는 URL이 아닌 경로 템플릿(/items/{item_id})이므로 라벨 수가 늘어나지 않습니다.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._accumulators = []
+        self._lock = threading.Lock()   # 새 쓰레드의 집계 값을 등록할 때만 사용합니다.
+
+    def _accumulator(self) -> _Accumulator:
+        try:
+            return self._local.accumulator
+        except AttributeError:
+            accumulator = self._local.accumulator = _Accumulator(len(self.buckets))
+            with self._lock:
+                self._accumulators.append(accumulator)
+            return accumulator
+
+    def request_started(self, method: str):
+        self._accumulator().in_flight[method] += 1
+
+    def request_finished(self, method: str, route: str, status: int, size: int, duration: float):
+        accumulator = self._accumulator()
+        accumulator.in_flight[method] -= 1
+        accumulator.requests[(method, route, status)] += 1
+        accumulator.response_bytes[(method, route)] += size
+        histogram = accumulator.histograms.get((method, route))
+        if histogram is None:
+            histogram = accumulator.histograms[(method, route)] = [0] * (len(self.buckets) + 3)
+        histogram[bisect.bisect_left(self.buckets, duration)] += 1
+        histogram[-2] += duration
+        histogram[-1] += 1
+
+    def _merge(self):
+        with self._lock:
+            accumulators = list(self._accumulators)
+        requests = defaultdict(int)
+        response_bytes = defaultdict(int)
+        histograms = {}
+        in_flight = defaultdict(int)
+        for accumulator in accumulators:
+            # dict.copy()는 GIL을 놓지 않으므로 다른 쓰레드가 갱신 중이어도 안전하게 복사됩니다.
+            for key, value in accumulator.requests.copy().items():
+                requests[key] += value
+            for key, value in accumulator.response_bytes.copy().items():
+                response_bytes[key] += value
+            for key, value in accumulator.in_flight.copy().items():
+                in_flight[key] += value
+            for key, histogram in accumulator.histograms.copy().items():
+                merged = histograms.setdefault(key, [0] * len(histogram))
+                for index, value in enumerate(list(histogram)):
+                    merged[index] += value
+        return requests, response_bytes, histograms, in_flight
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식(0.0.4)으로 출력합니다."""
+        requests, response_bytes, histograms, in_flight = self._merge()
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(requests.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {value}')
+
+        lines += [
+            "# HELP http_response_size_bytes_total Total response body bytes by route.",
+            "# TYPE http_response_size_bytes_total counter",
+        ]
+        for (method, route), value in sorted(response_bytes.items()):
+            lines.append(f'http_response_size_bytes_total{{method="{method}",route="{_escape(route)}"}} {value}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request duration until the last response byte was sent.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, value in zip(self.buckets, histogram):
+                cumulative += value
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram[-1]}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram[-2]:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram[-1]}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being processed.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, value in sorted(in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{method}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
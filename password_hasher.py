@@ -0,0 +1,135 @@
+import asyncio
+import hmac
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = 12                  # bcrypt 비용 (이보다 낮은 비용의 해시는 로그인 성공 시 다시 해시)
+HASH_CONCURRENCY = 4                # 동시에 실행할 수 있는 해시/검증 작업 수
+HASH_QUEUE_TIMEOUT = 2.0            # 실행 슬롯을 기다리는 최대 시간 (초)
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500)  # 지연 시간 히스토그램 구간 (ms)
+
+# - bcrypt: 새로 저장하는 모든 비밀번호
+# - plaintext: 해싱 도입 전에 평문으로 저장된 행 (deprecated이므로 로그인 성공 시 bcrypt로 바뀝니다)
+pwd_context = CryptContext(
+    schemes=["bcrypt", "plaintext"],
+    deprecated=["plaintext"],
+    bcrypt__rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """실행 슬롯을 HASH_QUEUE_TIMEOUT 안에 얻지 못했을 때 발생합니다. (HTTP 503으로 변환)"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("password hasher is busy")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증을 전용 쓰레드 풀에서 실행합니다.
+    - bcrypt는 GIL을 놓고 계산하므로 쓰레드로도 CPU 코어를 나눠 쓸 수 있습니다.
+    - 동시 실행 수를 concurrency로 제한하고, 슬롯을 기다리는 동안은 이벤트 루프에서 기다리므로
+      로그인이 몰려도 다른 sync 라우트가 쓰는 기본 쓰레드 풀을 차지하지 않습니다.
+    - queue_timeout 안에 슬롯을 얻지 못하면 PasswordHasherBusyError로 거절합니다.
+    """
+
+    def __init__(self, context: CryptContext = pwd_context,
+                 concurrency: int = HASH_CONCURRENCY, queue_timeout: float = HASH_QUEUE_TIMEOUT):
+        self.context = context
+        self.concurrency = concurrency
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="password-hash")
+        self._slots = asyncio.Semaphore(concurrency)
+        self._dummy_hash = None
+        self._lock = threading.Lock()
+        self._count = 0
+        self._rejected = 0
+        self._waiting = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._wait_total = 0.0
+        self._buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    async def _run(self, func, *args):
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise PasswordHasherBusyError()
+        finally:
+            self._waiting -= 1
+
+        try:
+            started = time.perf_counter()
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+            self._record(started - queued, time.perf_counter() - started)
+            return result
+        finally:
+            self._slots.release()
+
+    def _record(self, waited: float, elapsed: float):
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            self._count += 1
+            self._wait_total += waited
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+            for index, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self._buckets[index] += 1
+                    break
+            else:
+                self._buckets[-1] += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, stored_hash: str):
+        """
+        (일치 여부, 새 해시 또는 None)을 반환합니다.
+        평문으로 저장된 행이나 비용이 낮은 bcrypt 해시는 일치할 때 새 해시를 함께 돌려줍니다.
+        """
+        return await self._run(self._verify_and_update_sync, password, stored_hash)
+
+    def _verify_and_update_sync(self, password: str, stored_hash: str):
+        if self.context.identify(stored_hash) == "plaintext":
+            # passlib의 plaintext 비교는 상수 시간이 아니므로 직접 비교합니다.
+            if not hmac.compare_digest(password.encode("utf-8"), stored_hash.encode("utf-8")):
+                return False, None
+            return True, self.context.hash(password)
+        return self.context.verify_and_update(password, stored_hash)
+
+    async def dummy_verify(self, password: str):
+        """
+        없는 사용자로 로그인할 때도 같은 비용의 검증을 수행해서
+        응답 시간으로 사용자 존재 여부가 드러나지 않게 합니다.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash("dummy-password")
+        await self._run(self.context.verify, password, self._dummy_hash)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._count
+            buckets = {f"le_{bound}ms": n for bound, n in zip(LATENCY_BUCKETS_MS, self._buckets)}
+            buckets["gt_{}ms".format(LATENCY_BUCKETS_MS[-1])] = self._buckets[-1]
+            return {
+                "concurrency": self.concurrency,
+                "queue_timeout_sec": self.queue_timeout,
+                "waiting": self._waiting,
+                "completed": count,
+                "rejected": self._rejected,
+                "latency_avg_ms": round(self._latency_total / count * 1000, 3) if count else 0.0,
+                "latency_max_ms": round(self._latency_max * 1000, 3),
+                "queue_wait_avg_ms": round(self._wait_total / count * 1000, 3) if count else 0.0,
+                "latency_histogram": buckets,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,130 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+
+RATE_LIMIT_SHARDS = 64               # 버킷 딕셔너리를 나누는 샤드 수 (샤드마다 잠금이 따로 있습니다)
+MAX_KEYS_PER_SHARD = 10000           # 샤드마다 보관할 최대 키 수 (넘으면 가장 오래 쓰지 않은 키부터 버립니다)
+
+
+class RateLimit:
+    """per_seconds 동안 requests번까지 허용하고, 순간적으로는 burst번까지 몰아서 허용합니다."""
+
+    def __init__(self, requests: int, per_seconds: float, burst: int = None):
+        self.requests = requests
+        self.per_seconds = per_seconds
+        self.burst = burst or requests
+        self.rate = requests / per_seconds  # 초당 채워지는 토큰 수
+
+    def __repr__(self):
+        return f"RateLimit({self.requests}/{self.per_seconds}s, burst={self.burst})"
+
+
+class RateLimitExceeded(Exception):
+    """요청 한도를 넘었을 때 발생합니다. (HTTP 429로 변환)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class _Shard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()  # key -> [남은 토큰 수, 마지막 갱신 시각]
+        self.allowed = 0
+        self.rejected = 0
+
+
+class ShardedRateLimiter:
+    """
+    키(IP, 사용자 이름, 토큰 subject 등)마다 토큰 버킷을 두는 프로세스 내 요청 제한기입니다.
+    - 키의 해시로 샤드를 고르고 샤드 단위로만 잠그므로, 요청이 많아도 하나의 잠금에 몰리지 않습니다.
+    - 버킷은 요청이 올 때 지난 시간만큼 토큰을 채우는 방식이라 별도의 타이머가 필요 없습니다.
+    - 오래 쓰지 않은 키는 샤드가 가득 찼을 때 버립니다. (오래 쉰 버킷은 어차피 가득 차 있습니다)
+    """
+
+    def __init__(self, shards: int = RATE_LIMIT_SHARDS, max_keys_per_shard: int = MAX_KEYS_PER_SHARD):
+        self._shards = [_Shard() for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    def hit(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        """토큰을 cost만큼 씁니다. 허용되면 0, 거절되면 다시 시도할 수 있을 때까지의 초를 반환합니다."""
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = shard.buckets[key] = [float(limit.burst), now]
+                if len(shard.buckets) > self.max_keys_per_shard:
+                    shard.buckets.popitem(last=False)
+            else:
+                shard.buckets.move_to_end(key)
+                bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                shard.allowed += 1
+                return 0.0
+            shard.rejected += 1
+            return (cost - bucket[0]) / limit.rate
+
+    def check(self, key: str, limit: RateLimit, cost: int = 1):
+        """한도를 넘으면 RateLimitExceeded를 발생시킵니다. (의존성/라우트 안에서 사용)"""
+        wait = self.hit(key, limit, cost)
+        if wait > 0:
+            raise RateLimitExceeded(math.ceil(wait))
+
+    def stats(self) -> dict:
+        return {
+            "shards": len(self._shards),
+            "keys": sum(len(shard.buckets) for shard in self._shards),
+            "allowed": sum(shard.allowed for shard in self._shards),
+            "rejected": sum(shard.rejected for shard in self._shards),
+        }
+
+
+def rate_limit_response(retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "요청이 너무 많습니다. 잠시 후 다시 시도하세요."},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    클라이언트 IP(request.client.host)별로 요청 수를 제한하는 ASGI 미들웨어입니다.
+    본문을 읽거나 의존성을 실행하기 전에 거절하므로 거절 비용이 작습니다.
+    route_limits에 경로별 한도를 주고, 없는 경로는 default_limit을 씁니다. (None이면 제한하지 않음)
+    """
+
+    def __init__(self, app, limiter: ShardedRateLimiter, route_limits: dict = None,
+                 default_limit: RateLimit = None):
+        self.app = app
+        self.limiter = limiter
+        self.route_limits = route_limits or {}
+        self.default_limit = default_limit
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        limit = self.route_limits.get(path, self.default_limit)
+        if limit is not None:
+            client = scope.get("client")
+            host = client[0] if client else "unknown"
+            # 경로별 한도가 있는 경로는 따로, 나머지는 기본 한도를 함께 씁니다.
+            bucket = path if path in self.route_limits else "*"
+            wait = self.limiter.hit(f"ip:{host}:{bucket}", limit)
+            if wait > 0:
+                response = rate_limit_response(math.ceil(wait))
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
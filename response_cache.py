@@ -0,0 +1,167 @@
+import gzip
+import time
+
+from ttl_cache import TTLCache
+
+RESPONSE_CACHE_SIZE = 1024           # 보관할 최대 응답 수
+RESPONSE_MAX_BODY = 1024 * 1024      # 이보다 큰 본문은 저장하지 않습니다. (1MB)
+GZIP_MIN_SIZE = 512                  # 이보다 작은 본문은 압축본을 만들지 않습니다.
+GZIP_LEVEL = 6                       # 저장할 때 한 번만 압축하므로 적당히 높은 수준을 씁니다.
+# 저장하지 않는 응답 헤더 (다시 만들거나, 처음 응답에만 맞는 값)
+STRIPPED_HEADERS = (b"content-length", b"vary", b"x-response-cache", b"x-fastapi-cache")
+
+
+class CachedResponse:
+    """
+    인코딩이 끝난 응답입니다. 상태 코드, 헤더 목록(content-length 포함), 본문을
+    전송할 형태 그대로 들고 있으므로 캐시 적중 시 다시 직렬화하거나 압축할 필요가 없습니다.
+    """
+    __slots__ = ("status", "headers", "body", "gzip_headers", "gzip_body", "created")
+
+    def __init__(self, status: int, headers: list, body: bytes):
+        self.status = status
+        self.created = time.time()
+        self.body = body
+        self.headers = headers + [(b"content-length", str(len(body)).encode()),
+                                  (b"x-response-cache", b"HIT")]
+        self.gzip_body = None
+        self.gzip_headers = None
+        if len(body) >= GZIP_MIN_SIZE:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+                self.gzip_headers = headers + [(b"content-encoding", b"gzip"),
+                                               (b"content-length", str(len(compressed)).encode()),
+                                               (b"x-response-cache", b"HIT")]
+
+
+def _accepts_gzip(accept_encoding: bytes) -> bool:
+    for token in accept_encoding.split(b","):
+        name, _, params = token.strip().partition(b";")
+        if name.strip() in (b"gzip", b"*"):
+            return params.replace(b" ", b"") not in (b"q=0", b"q=0.0", b"q=0.00", b"q=0.000")
+    return False
+
+
+class ResponseCache:
+    """
+    경로별 보관 시간(rules)과 인코딩된 응답 저장소입니다. ResponseCacheMiddleware에 넘겨서 사용합니다.
+    - 캐시 키: 경로 + 쿼리 문자열 + vary에 지정한 요청 헤더 값 (HEAD는 GET과 같은 항목을 쓰고 본문만 생략)
+    - 200 응답만 저장하며, Set-Cookie가 있거나 Cache-Control에 no-store / private가 있으면 저장하지 않습니다.
+    """
+
+    def __init__(self, rules: dict, vary: tuple = (), maxsize: int = RESPONSE_CACHE_SIZE):
+        self.rules = rules                              # 경로 -> 보관 시간(초)
+        self.vary = tuple(name.lower().encode() for name in vary)
+        self.vary_header = b", ".join((b"accept-encoding",) + self.vary)
+        self.store = TTLCache(maxsize=maxsize, ttl=60)
+        self.stored = 0
+        self.bypassed = 0
+
+    def key(self, scope, request_headers: dict):
+        return (scope["path"], scope["query_string"]) + tuple(request_headers.get(name, b"") for name in self.vary)
+
+    @staticmethod
+    def is_cacheable(status: int, headers: list) -> bool:
+        if status != 200:
+            return False
+        for name, value in headers:
+            name = name.lower()
+            if name == b"set-cookie" or name == b"content-encoding":
+                return False
+            if name == b"cache-control" and (b"no-store" in value or b"private" in value):
+                return False
+        return True
+
+    def put(self, key, ttl: int, status: int, headers: list, body: bytes):
+        # 길이 헤더는 보낼 본문(원본/압축본)에 맞춰 다시 만듭니다.
+        # 처음 만들 때 붙은 캐시 상태 헤더(x-fastapi-cache: MISS 등)는 적중할 때마다 그대로 나가면 안 되므로 뺍니다.
+        headers = [(name, value) for name, value in headers if name.lower() not in STRIPPED_HEADERS]
+        headers.append((b"vary", self.vary_header))
+        self.store.set(key, CachedResponse(status, headers, body), ttl=ttl)
+        self.stored += 1
+
+    def clear(self):
+        self.store.clear()
+
+    def stats(self) -> dict:
+        return {**self.store.stats(), "stored": self.stored, "bypassed": self.bypassed}
+
+
+class ResponseCacheMiddleware:
+    """
+    ResponseCache.rules에 있는 경로의 GET 응답을 인코딩된 바이트 그대로 저장했다가,
+    적중하면 ASGI send로 바로 보냅니다. 라우팅, 의존성, 엔드포인트 실행과 JSON 직렬화를 모두 건너뜁니다.
+    - 압축본(gzip)은 저장할 때 한 번 만들어 두고, Accept-Encoding에 따라 골라 보냅니다.
+    - 요청에 Cache-Control: no-cache / no-store가 있으면 캐시를 건너뛰고 새로 만든 응답을 저장합니다.
+    - Age 헤더로 저장된 지 몇 초 지났는지 알려 주므로, 저장된 Cache-Control의 max-age를 그대로 써도 됩니다.
+    """
+
+    def __init__(self, app, cache: ResponseCache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        ttl = self.cache.rules.get(scope["path"])
+        if ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        key = self.cache.key(scope, request_headers)
+        head = scope["method"] == "HEAD"
+        request_cache_control = request_headers.get(b"cache-control", b"")
+
+        if b"no-cache" in request_cache_control or b"no-store" in request_cache_control:
+            self.cache.bypassed += 1
+        else:
+            entry = self.cache.store.get(key)
+            if entry is not None:
+                use_gzip = _accepts_gzip(request_headers.get(b"accept-encoding", b""))
+                await self._send_cached(entry, send, use_gzip, head)
+                return
+
+        await self.app(scope, receive, self._capture(send, key, ttl, head))
+
+    @staticmethod
+    async def _send_cached(entry: CachedResponse, send, use_gzip: bool, head: bool):
+        if use_gzip and entry.gzip_body is not None:
+            headers, body = entry.gzip_headers, entry.gzip_body
+        else:
+            headers, body = entry.headers, entry.body
+        age = str(int(time.time() - entry.created)).encode()
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers + [(b"age", age)]})
+        await send({"type": "http.response.body", "body": b"" if head else body})
+
+    def _capture(self, send, key, ttl: int, head: bool):
+        """응답을 그대로 보내면서 본문을 모아 두었다가, 저장할 수 있는 응답이면 캐시에 넣습니다."""
+        cache = self.cache
+        state = {"start": None, "chunks": [], "size": 0, "cacheable": False}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                state["start"] = (message["status"], headers)
+                state["cacheable"] = not head and cache.is_cacheable(message["status"], headers)
+                extra = [(b"x-response-cache", b"MISS")]
+                if state["cacheable"]:
+                    headers = [(name, value) for name, value in headers if name.lower() != b"vary"]
+                    extra.append((b"vary", cache.vary_header))
+                message = {**message, "headers": headers + extra}
+            elif message["type"] == "http.response.body" and state["cacheable"]:
+                body = message.get("body", b"")
+                state["size"] += len(body)
+                if state["size"] > RESPONSE_MAX_BODY:
+                    state["cacheable"] = False
+                    state["chunks"].clear()
+                else:
+                    state["chunks"].append(body)
+                    if not message.get("more_body", False):
+                        status, headers = state["start"]
+                        cache.put(key, ttl, status, headers, b"".join(state["chunks"]))
+            await send(message)
+
+        return capture_send
@@ -0,0 +1,106 @@
+import hashlib
+import os
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from ttl_cache import TTLCache
+
+# 컴파일된 템플릿(바이트코드)을 저장하는 폴더 (워커와 재시작 사이에 공유됩니다)
+TEMPLATE_BYTECODE_DIR = os.getenv("TEMPLATE_BYTECODE_DIR", str(Path(__file__).parent / ".jinja_cache"))
+FRAGMENT_CACHE_SIZE = 1000     # 보관할 최대 조각 수
+FRAGMENT_CACHE_TTL = 300       # {% cache %}에 ttl을 주지 않았을 때의 유효 시간 (초)
+
+
+class FragmentCacheExtension(Extension):
+    """
+    템플릿의 일부를 렌더링한 결과를 캐싱하는 {% cache 키, ttl %} ... {% endcache %} 태그입니다.
+    - 같은 키로 다시 렌더링하면 안쪽 블록을 실행하지 않고 저장된 HTML을 그대로 씁니다.
+    - ttl(초)을 생략하면 FRAGMENT_CACHE_TTL을 씁니다.
+    - 데이터가 바뀌면 invalidate_fragments()로 해당 키를 지웁니다.
+    키에는 조각 내용을 바꾸는 값(사용자 ID 등)을 모두 넣어야 합니다. 예: {% cache "items:" ~ user.id %}
+    """
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=TTLCache(maxsize=FRAGMENT_CACHE_SIZE, ttl=FRAGMENT_CACHE_TTL))
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render_fragment", args), [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, key, ttl, caller):
+        cache = self.environment.fragment_cache
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        # 렌더링하는 사이에 무효화되면 오래된 조각을 저장하지 않도록 버전을 먼저 받아 둡니다.
+        version = cache.version()
+        if self.environment.is_async:
+            return self._render_fragment_async(key, ttl, caller, version)
+        rendered = Markup(caller())
+        cache.set(key, rendered, ttl=ttl, version=version)
+        return rendered
+
+    async def _render_fragment_async(self, key, ttl, caller, version):
+        rendered = Markup(await caller())
+        self.environment.fragment_cache.set(key, rendered, ttl=ttl, version=version)
+        return rendered
+
+
+def create_templates(directory: str, bytecode_cache_dir: str = TEMPLATE_BYTECODE_DIR, **env_options) -> Jinja2Templates:
+    """
+    디스크 바이트코드 캐시와 {% cache %} 태그가 적용된 Jinja2Templates를 만듭니다.
+    바이트코드 캐시는 템플릿 원본의 체크섬으로 검증하므로, 템플릿을 고치면 자동으로 다시 컴파일됩니다.
+    """
+    env_options["extensions"] = [*env_options.get("extensions", ()), FragmentCacheExtension]
+    templates = Jinja2Templates(directory=directory, **env_options)
+    env = templates.env
+    if env.bytecode_cache is None:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir, f"__jinja2_%s_{_compile_options_tag(env)}.cache")
+    return templates
+
+
+def _compile_options_tag(env) -> str:
+    """
+    바이트코드는 템플릿 원본뿐 아니라 환경 설정(async 여부, 확장, 구분자 등)에 따라 달라집니다.
+    같은 폴더를 설정이 다른 환경끼리 써도 서로의 바이트코드를 읽지 않도록 파일 이름에 넣을 값을 만듭니다.
+    """
+    options = (
+        env.is_async, sorted(env.extensions), env.autoescape if isinstance(env.autoescape, bool) else "callable",
+        env.block_start_string, env.block_end_string, env.variable_start_string, env.variable_end_string,
+        env.comment_start_string, env.comment_end_string, env.line_statement_prefix, env.line_comment_prefix,
+        env.trim_blocks, env.lstrip_blocks, env.newline_sequence, env.keep_trailing_newline, env.optimized,
+    )
+    return hashlib.sha1(repr(options).encode()).hexdigest()[:12]
+
+
+def warm_up_templates(templates: Jinja2Templates) -> list:
+    """
+    모든 템플릿을 미리 불러와서(바이트코드 캐시가 있으면 그것으로, 없으면 컴파일해서) 메모리에 올립니다.
+    서버 시작 시 호출하면 각 워커의 첫 요청이 컴파일 비용을 내지 않습니다.
+    """
+    names = templates.env.list_templates()
+    for name in names:
+        templates.env.get_template(name)
+    return names
+
+
+def invalidate_fragments(templates: Jinja2Templates, *keys):
+    """{% cache %} 조각을 지웁니다. 키를 주지 않으면 모두 지웁니다."""
+    cache = templates.env.fragment_cache
+    if keys:
+        cache.invalidate(*keys)
+    else:
+        cache.clear()
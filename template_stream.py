@@ -0,0 +1,63 @@
+import time
+
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from starlette.concurrency import iterate_in_threadpool
+
+TEMPLATE_STREAM_CHUNK_SIZE = 16 * 1024   # 작은 조각을 이 크기(바이트)까지 모아서 보냅니다.
+TEMPLATE_STREAM_MAX_DELAY = 0.05         # 모으는 중이라도 이 시간(초)이 지나면 보냅니다.
+
+
+def coalesce_chunks(chunks, chunk_size: int = TEMPLATE_STREAM_CHUNK_SIZE, max_delay: float = TEMPLATE_STREAM_MAX_DELAY):
+    """
+    템플릿이 만드는 작은 문자열 조각들을 chunk_size 바이트 단위로 묶어 bytes로 돌려주는 async 제너레이터입니다.
+    조각이 천천히 나오면(느린 데이터 소스) chunk_size를 채우지 못해도 max_delay가 지난 뒤 다음 조각에서 보냅니다.
+    """
+    async def generate():
+        buffer = []
+        size = 0
+        started = None
+        async for chunk in chunks:
+            data = chunk.encode("utf-8")
+            if not data:
+                continue
+            if started is None:
+                started = time.monotonic()
+            buffer.append(data)
+            size += len(data)
+            if size >= chunk_size or time.monotonic() - started >= max_delay:
+                data = b"".join(buffer)
+                # {% cache %} 조각처럼 한 번에 큰 덩어리가 나오면 chunk_size로 잘라 보냅니다.
+                for start in range(0, len(data), chunk_size):
+                    yield data[start:start + chunk_size]
+                buffer.clear()
+                size = 0
+                started = None
+        if buffer:
+            yield b"".join(buffer)
+
+    return generate()
+
+
+def stream_template(templates: Jinja2Templates, name: str, context: dict, status_code: int = 200,
+                    headers: dict = None, chunk_size: int = TEMPLATE_STREAM_CHUNK_SIZE) -> StreamingResponse:
+    """
+    템플릿을 한 문자열로 다 만들지 않고, 렌더링되는 대로 나눠 보내는 응답을 만듭니다.
+    - 첫 바이트가 빨리 나가고, 큰 목록을 그려도 메모리에는 chunk_size 정도만 머뭅니다.
+    - enable_async=True 환경이면 generate_async()를 쓰므로 context에 async 제너레이터를 넣어
+      {% for %}에서 바로 돌 수 있습니다. 동기 환경이면 generate()를 쓰레드풀에서 돌립니다.
+    - {% cache %} 블록은 캐시에 없을 때 블록 전체를 한 번에 렌더링하므로, 나눠 보내야 하는 긴 반복문이나
+      async 데이터 소스를 도는 반복문은 {% cache %} 밖에 두어야 합니다.
+    - 응답 헤더를 먼저 보내므로, 렌더링 도중 오류가 나면 상태 코드를 바꿀 수 없고 연결이 끊깁니다.
+      오류가 날 수 있는 값은 context를 만들 때 미리 확인해야 합니다.
+    TemplateResponse와 같이 context에는 "request"가 있어야 합니다.
+    """
+    if "request" not in context:
+        raise ValueError('context에 "request"가 있어야 합니다.')
+    template = templates.get_template(name)
+    if template.environment.is_async:
+        chunks = template.generate_async(context)
+    else:
+        chunks = iterate_in_threadpool(template.generate(context))
+    return StreamingResponse(coalesce_chunks(chunks, chunk_size), status_code=status_code,
+                             headers=headers, media_type="text/html")
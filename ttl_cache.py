@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시에 "없음"을 저장할 때 사용하는 표식 (None도 정상 값일 수 있으므로 따로 둡니다)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    크기 제한(LRU)과 만료 시간(TTL)을 가진 쓰레드 안전 캐시입니다.
+    - 가득 차면 가장 오래 사용하지 않은 항목부터 버립니다.
+    - 항목마다 다른 TTL을 줄 수 있습니다. (예: 없는 값은 짧게 캐싱)
+    - hit / miss / eviction / expired 횟수를 stats()로 확인할 수 있습니다.
+
+    읽은 값을 채워 넣는 사이에 무효화가 일어나면 오래된 값이 다시 들어갈 수 있으므로,
+    조회 전에 version()을 받아 두고 set(..., version=...)으로 넣으면
+    그 사이에 무효화가 있었을 때는 저장하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __contains__(self, key) -> bool:
+        """통계에 영향을 주지 않고 (만료되지 않은) 항목이 있는지만 확인합니다."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def set(self, key, value, ttl: float = None, version: int = None) -> bool:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if version is not None and version != self._version:
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "invalidations": self.invalidations,
+            }
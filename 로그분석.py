@@ -0,0 +1,270 @@
+"""
+로깅.py가 남기는 access.log를 분석합니다.
+형식: 클라이언트 - - [시간] "메서드 경로 HTTP/버전" 상태 응답바이트 "User-Agent" [처리시간(ms)]
+(상태/바이트가 "-"인 예전 형식과 처리시간이 없는 줄도 읽습니다)
+
+- 파일을 mmap으로 열고 일정 크기(chunk)씩 잘라 읽으므로 파일 전체를 메모리에 올리지 않습니다.
+- --workers N 이면 파일을 바이트 구간 N개로 나눠 프로세스마다 따로 분석하고 결과를 합칩니다.
+- 상위 경로 / User-Agent / IP는 고정된 개수만 추적하고(TopCounter),
+  처리 시간은 로그 스케일 구간 히스토그램으로 모으므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+  (시간대별 요청 수만 로그가 다루는 기간에 비례합니다)
+
+실행: python 로그분석.py access.log [--workers 4] [--interval 60] [--top 10]
+"""
+import argparse
+import math
+import mmap
+import multiprocessing
+import os
+import re
+from datetime import datetime
+
+CHUNK_SIZE = 8 * 1024 * 1024      # 한 번에 읽는 바이트 수
+TOP_CAPACITY_FACTOR = 100         # 상위 N개를 구할 때 추적하는 항목 수 (N의 배수)
+LATENCY_GROWTH = 1.05             # 처리 시간 히스토그램 구간의 증가 비율 (백분위 오차 약 5% 이내)
+LATENCY_MIN_MS = 0.01             # 이보다 짧은 처리 시간은 첫 구간에 넣습니다.
+
+LINE_PATTERN = re.compile(
+    rb'^(\S+) \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)[^"]*" (\S+) (\S+) "([^"]*)"(?: ([\d.]+))?\r?$',
+    re.MULTILINE,
+)
+
+
+class TopCounter:
+    """
+    등장 횟수가 많은 항목을 고정된 메모리로 추적합니다.
+    항목 수가 capacity의 두 배를 넘으면 횟수가 많은 capacity개만 남기고 나머지는 버립니다.
+    (정렬은 capacity번 추가할 때 한 번이므로 항목당 비용이 작습니다)
+    버린 항목이 다시 나타나면 0부터 다시 세므로, 각 항목의 횟수는 최대 error만큼 적게 셀 수 있습니다.
+    capacity를 구하려는 상위 개수보다 넉넉히 잡으면 상위 항목은 거의 정확합니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = {}
+        self.error = 0      # 어떤 항목이든 실제보다 적게 셌을 수 있는 최대 횟수
+
+    def add(self, item, count: int = 1):
+        counts = self.counts
+        counts[item] = counts.get(item, 0) + count
+        if len(counts) > self.capacity * 2:
+            self._prune()
+
+    def _prune(self):
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        if len(ranked) > self.capacity:
+            # 버려지는 항목은 각각 이 횟수 이하이므로, 정리할 때마다 더하면 오차의 상한이 됩니다.
+            self.error += ranked[self.capacity][1]
+        self.counts = dict(ranked[:self.capacity])
+
+    def merge(self, other: "TopCounter"):
+        for item, count in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+        self.error += other.error
+        if len(self.counts) > self.capacity * 2:
+            self._prune()
+
+    def top(self, n: int):
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+class LatencyHistogram:
+    """로그 스케일 구간 히스토그램입니다. 구간 수가 처리 시간 범위에만 의존하므로 메모리가 일정합니다."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float):
+        index = 0 if value_ms <= LATENCY_MIN_MS else int(math.log(value_ms / LATENCY_MIN_MS, LATENCY_GROWTH)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # 구간의 위쪽 경계를 돌려줍니다. (실제 값보다 최대 LATENCY_GROWTH배 큼)
+                return min(self.max, LATENCY_MIN_MS * LATENCY_GROWTH ** index)
+        return self.max
+
+
+class LogStats:
+    def __init__(self, top: int, interval: int):
+        capacity = top * TOP_CAPACITY_FACTOR
+        self.top = top
+        self.interval = interval
+        self.lines = 0
+        self.unparsed = 0
+        self.paths = TopCounter(capacity)
+        self.user_agents = TopCounter(capacity)
+        self.clients = TopCounter(capacity)
+        self.statuses = {}
+        self.per_interval = {}           # 구간 시작 시각(초) -> 요청 수
+        self.latency = LatencyHistogram()
+        self.first = None
+        self.last = None
+        self.tz = None                   # 로그에 적힌 시간대 (출력할 때 사용)
+
+    def merge(self, other: "LogStats"):
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        self.paths.merge(other.paths)
+        self.user_agents.merge(other.user_agents)
+        self.clients.merge(other.clients)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        for start, count in other.per_interval.items():
+            self.per_interval[start] = self.per_interval.get(start, 0) + count
+        self.latency.merge(other.latency)
+        self.tz = self.tz or other.tz
+        if other.first is not None:
+            self.first = other.first if self.first is None else min(self.first, other.first)
+            self.last = other.last if self.last is None else max(self.last, other.last)
+
+
+def analyze_range(path: str, start: int, end: int, top: int, interval: int) -> LogStats:
+    """파일의 [start, end) 구간을 chunk 단위로 읽어 분석합니다. start/end는 줄의 시작 위치여야 합니다."""
+    stats = LogStats(top, interval)
+    last_stamp = None
+    last_epoch = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            chunk_end = min(end, position + CHUNK_SIZE)
+            if chunk_end < end:
+                # 줄 중간에서 자르지 않도록 마지막 줄바꿈까지만 읽습니다.
+                newline = mm.rfind(b"\n", position, chunk_end)
+                chunk_end = newline + 1 if newline >= position else mm.find(b"\n", chunk_end, end) + 1 or end
+            chunk = mm[position:chunk_end]
+            chunk_start, position = position, chunk_end
+
+            chunk_lines = chunk.count(b"\n") + (0 if chunk.endswith(b"\n") else 1)
+            parsed = 0
+            for match in LINE_PATTERN.finditer(chunk):
+                client, stamp, _method, request_path, status, _size, user_agent, duration = match.groups()
+                parsed += 1
+                if stamp != last_stamp:
+                    # 같은 초의 줄은 시간 문자열이 같으므로 직전 결과를 재사용합니다.
+                    try:
+                        moment = datetime.strptime(stamp.decode(), "%d/%b/%Y:%H:%M:%S %z")
+                    except ValueError:
+                        parsed -= 1
+                        continue
+                    last_stamp = stamp
+                    last_epoch = int(moment.timestamp())
+                    stats.tz = moment.tzinfo
+                stats.paths.add(request_path)
+                stats.user_agents.add(user_agent)
+                stats.clients.add(client)
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+                bucket = last_epoch - last_epoch % interval
+                stats.per_interval[bucket] = stats.per_interval.get(bucket, 0) + 1
+                if stats.first is None or last_epoch < stats.first:
+                    stats.first = last_epoch
+                if stats.last is None or last_epoch > stats.last:
+                    stats.last = last_epoch
+                if duration:
+                    stats.latency.add(float(duration))
+            stats.lines += chunk_lines
+            stats.unparsed += chunk_lines - parsed
+
+            # 다 읽은 페이지를 이 프로세스의 메모리에서 내려서, 파일이 커져도 메모리 사용량이 늘지 않게 합니다.
+            release_from = chunk_start - chunk_start % mmap.PAGESIZE
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED") and chunk_end > release_from:
+                mm.madvise(mmap.MADV_DONTNEED, release_from, chunk_end - release_from)
+    return stats
+
+
+def split_ranges(path: str, parts: int):
+    """파일을 parts개의 바이트 구간으로 나눕니다. 각 구간은 줄의 시작에서 시작합니다."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for index in range(1, parts):
+            offset = max(bounds[-1], size * index // parts)
+            newline = mm.find(b"\n", offset)
+            if newline == -1:
+                break
+            bounds.append(newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def analyze(path: str, workers: int = 1, top: int = 10, interval: int = 60) -> LogStats:
+    ranges = split_ranges(path, workers)
+    total = LogStats(top, interval)
+    if workers <= 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            total.merge(analyze_range(path, start, end, top, interval))
+        return total
+    with multiprocessing.Pool(len(ranges)) as pool:
+        for stats in pool.starmap(analyze_range, [(path, start, end, top, interval) for start, end in ranges]):
+            total.merge(stats)
+    return total
+
+
+def print_report(stats: LogStats):
+    def text(value: bytes) -> str:
+        return value.decode("utf-8", "replace")
+
+    print(f"전체 줄 수: {stats.lines:,}  (해석하지 못한 줄: {stats.unparsed:,})")
+    if stats.first is None:
+        return
+    def moment(epoch: int) -> datetime:
+        return datetime.fromtimestamp(epoch, stats.tz)
+
+    span = max(1, stats.last - stats.first + 1)
+    parsed = stats.lines - stats.unparsed
+    print(f"기간: {moment(stats.first)} ~ {moment(stats.last)}  "
+          f"(평균 {parsed / span:,.2f} req/s)")
+
+    print(f"\n[{stats.interval}초 구간별 요청 수 (req/s)]")
+    for start in sorted(stats.per_interval):
+        count = stats.per_interval[start]
+        print(f"  {moment(start)}  {count:>10,}  {count / stats.interval:>10,.2f}")
+
+    print("\n[상태 코드]")
+    for status, count in sorted(stats.statuses.items()):
+        print(f"  {text(status):<6} {count:>10,}")
+
+    for title, counter in (("경로", stats.paths), ("User-Agent", stats.user_agents), ("클라이언트 IP", stats.clients)):
+        note = f"  (근사값: 횟수가 최대 {counter.error:,}만큼 적을 수 있음)" if counter.error else ""
+        print(f"\n[상위 {title}]{note}")
+        for item, count in counter.top(stats.top):
+            print(f"  {count:>10,}  {text(item)}")
+
+    latency = stats.latency
+    print("\n[처리 시간 (ms)]")
+    if latency.count == 0:
+        print("  처리 시간이 기록된 줄이 없습니다.")
+        return
+    print(f"  개수 {latency.count:,}  평균 {latency.total / latency.count:.3f}  최대 {latency.max:.3f}")
+    for p in (50, 90, 95, 99, 99.9):
+        print(f"  p{p:<5} {latency.percentile(p):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="access.log 분석")
+    parser.add_argument("path", nargs="?", default="access.log")
+    parser.add_argument("--workers", type=int, default=1, help="파일을 나눠 분석할 프로세스 수")
+    parser.add_argument("--interval", type=int, default=60, help="요청 수를 집계할 구간 (초)")
+    parser.add_argument("--top", type=int, default=10, help="상위 항목 개수")
+    args = parser.parse_args()
+    print_report(analyze(args.path, args.workers, args.top, args.interval))
@@ -1,16 +1,25 @@
-from fastapi import FastAPI, Request
-from datetime import datetime, timezone, timedelta
-import logging
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+import os
+
+from access_log import AccessLogMiddleware, BatchedLogWriter
+from metrics import RequestMetrics
 
 app = FastAPI()
 
-logger = logging.getLogger("access_log11")
+# 요청마다 파일에 직접 쓰지 않고, 큐에 넣어 두면 백그라운드 쓰레드가 모아서 씁니다.
+# - ACCESS_LOG_POLICY: 큐가 가득 찼을 때 drop(버림) / block(잠시 기다림)
+# - 100MB를 넘거나 하루가 지나면 access.log.<시각>으로 보관하고 새 파일에 씁니다.
+access_log = BatchedLogWriter(
+    "access.log",
+    max_bytes=100 * 1024 * 1024,
+    rotate_interval=24 * 60 * 60,
+    backup_count=7,
+    policy=os.getenv("ACCESS_LOG_POLICY", "drop"),
+)
 
-logger.setLevel(logging.INFO)
-handler = logging.FileHandler("access.log")
-formatter = logging.Formatter('%(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+# 경로별 요청 수 / 상태 코드 / 처리 시간 히스토그램 (GET /metrics에서 Prometheus 형식으로 제공)
+request_metrics = RequestMetrics()
 
 """
 log_format_fields = [
@@ -29,27 +38,32 @@ log_format_fields = [
 ]
 """
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    KST = timezone(timedelta(hours=9))
-    start_time = datetime.now(KST)
-    timestamp = start_time.strftime("%d/%b/%Y:%H:%M:%S %z")
-    client_host = request.client.host
-    method = request.method
-    path = request.url.path
-    user_agent = request.headers.get("user-agent", "-")
+@app.on_event("startup")
+def start_access_log():
+    access_log.start()
 
-    log_format = f'{client_host} - - [{timestamp}] "{method} {path} HTTP/1.1" - - "{user_agent}"'
-    logger.info(log_format)
+@app.on_event("shutdown")
+def stop_access_log():
+    # 큐에 남은 로그를 모두 쓰고 종료합니다.
+    access_log.close()
 
-    response = await call_next(request)
-    return response
+# 응답을 모두 보낸 뒤에 상태 코드, 응답 크기, 처리 시간을 포함한 로그를 남기고 경로별 지표를 모읍니다.
+app.add_middleware(AccessLogMiddleware, writer=access_log, metrics=request_metrics)
 
 
 @app.get("/")
 async def sample_endpoint():
     return None
 
+@app.get("/health/access-log")
+async def access_log_health():
+    # 큐에 쌓인 줄 수, 쓴 줄 수, 버린 줄 수를 확인합니다.
+    return access_log.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
 
 
 
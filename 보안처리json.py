@@ -1,9 +1,20 @@
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel, validator, Field
+import json
+import re
+import time
+
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 
 app = FastAPI()
 
+# bio 검사용 패턴은 한 번만 컴파일해 둡니다. (.lower() 복사본을 만들지 않고 대소문자 구분 없이 찾습니다)
+LINE_BREAK_PATTERN = re.compile(r"[\r\n]")
+SCRIPT_TAG_PATTERN = re.compile(r"<script>", re.IGNORECASE)
+
+BULK_MAX_LINE_BYTES = 64 * 1024      # NDJSON 한 줄의 최대 크기 - 넘으면 그 줄은 거절하고 건너뜁니다.
+
 
 # {"username": "testuser", "user_id": 1, "bio": "<script>"}
 class UserProfile(BaseModel):
@@ -12,13 +23,14 @@ class UserProfile(BaseModel):
     user_id: int
     bio: str
 
-    @validator('bio')
-    def prevent_line_breaks11(cls, v):
-        if '\n' in v or '\r' in v:
+    @field_validator('bio')
+    @classmethod
+    def prevent_line_breaks11(cls, v: str) -> str:
+        if LINE_BREAK_PATTERN.search(v):
             raise ValueError('줄 바꿈 문자는 bio 필드에 허용되지 않습니다.')
 
         # 특정 악성 스크립트 패턴을 확인 (매우 간단한 예시)
-        if '<script>' in v.lower():
+        if SCRIPT_TAG_PATTERN.search(v):
             # 실제 서비스에서는 더 복잡한 정규 표현식 기반의 필터링이 필요
             raise ValueError('악성 스크립트 패턴이 감지되었습니다.')
         return v.strip()
@@ -31,4 +43,106 @@ async def create_profile(profile: UserProfile):
         "username": profile.username,
         "user_id": profile.user_id,
         "bio_length": len(profile.bio)
-    }
\ No newline at end of file
+    }
+
+
+def validate_profile_line(line_number: int, line: bytes) -> dict:
+    """NDJSON 한 줄을 검증하고 결과(accepted / rejected와 사유)를 돌려줍니다."""
+    try:
+        profile = UserProfile.model_validate_json(line)
+    except ValidationError as e:
+        reason = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+            for error in e.errors(include_url=False)
+        )
+        return {"line": line_number, "status": "rejected", "reason": reason}
+    return {"line": line_number, "status": "accepted", "user_id": profile.user_id, "username": profile.username}
+
+
+async def validate_profile_stream(request: Request):
+    """
+    요청 본문을 받는 대로 줄 단위로 나눠 검증하고, 받은 조각마다 결과 줄들을 묶어서 바로 돌려줍니다.
+    본문 전체를 메모리에 올리지 않으므로, 행 수와 관계없이 메모리는 조각 하나와 줄 하나 크기만 씁니다.
+    마지막 줄에는 전체 행 수, 통과/거절 수와 초당 처리 행 수를 담은 summary를 보냅니다.
+    """
+    started = time.perf_counter()
+    counts = {"rows": 0, "accepted": 0, "rejected": 0}
+    pending = b""            # 아직 줄 바꿈을 만나지 못한 마지막 줄 조각
+    skipping = False         # 너무 긴 줄의 나머지를 버리는 중인지
+    line_number = 0
+
+    def handle(line: bytes, results: list):
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        result = validate_profile_line(line_number, line)
+        counts["rows"] += 1
+        counts[result["status"]] += 1
+        results.append(json.dumps(result, ensure_ascii=False))
+
+    def reject_too_long(results: list):
+        nonlocal line_number
+        line_number += 1
+        counts["rows"] += 1
+        counts["rejected"] += 1
+        results.append(json.dumps({"line": line_number, "status": "rejected",
+                                   "reason": f"줄이 {BULK_MAX_LINE_BYTES}바이트를 넘습니다."}, ensure_ascii=False))
+
+    async for chunk in request.stream():
+        results = []
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if skipping:
+                skipping = False     # 너무 긴 줄이 여기서 끝났습니다. (거절 결과는 이미 보냈습니다)
+                continue
+            if len(line) > BULK_MAX_LINE_BYTES:
+                reject_too_long(results)
+                continue
+            handle(line, results)
+        if len(pending) > BULK_MAX_LINE_BYTES:
+            if not skipping:
+                reject_too_long(results)
+                skipping = True
+            pending = b""
+        if results:
+            yield ("\n".join(results) + "\n").encode("utf-8")
+
+    results = []
+    if pending and not skipping:
+        handle(pending, results)
+    elapsed = time.perf_counter() - started
+    results.append(json.dumps({"summary": {
+        **counts,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(counts["rows"] / elapsed) if elapsed > 0 else 0,
+    }}))
+    yield ("\n".join(results) + "\n").encode("utf-8")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 응답을 보내는 StreamingResponse입니다.
+    기본 StreamingResponse는 연결 끊김을 확인하려고 receive()를 따로 기다리는데, 그러면 아직 읽지 않은
+    요청 본문 조각을 가로채 버립니다. 여기서는 본문을 읽는 쪽(request.stream())이 연결 끊김을
+    ClientDisconnect로 알려 주므로 따로 기다리지 않습니다.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/profiles/bulk")
+async def create_profiles_bulk(request: Request):
+    """
+    한 줄에 프로필 하나씩 담은 NDJSON(application/x-ndjson)을 받아 줄마다 검증 결과를 NDJSON으로 돌려줍니다.
+    예: {"line": 1, "status": "accepted", ...} / {"line": 2, "status": "rejected", "reason": "..."}
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type and not content_type.startswith(("application/x-ndjson", "application/jsonl", "text/plain")):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="NDJSON(application/x-ndjson) 본문만 받습니다.")
+    return RequestStreamingResponse(validate_profile_stream(request), media_type="application/x-ndjson")
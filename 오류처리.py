@@ -1,9 +1,44 @@
+import asyncio
+import json
+
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+
+from access_log import BatchedLogWriter, route_template
+from error_reporter import ErrorAggregator
 
 
 app = FastAPI()
 
+# 오류 요약 기록은 큐에 넣고 바로 돌아오며, 파일 쓰기는 백그라운드 쓰레드가 합니다.
+error_log = BatchedLogWriter("error.log", max_bytes=10 * 1024 * 1024, backup_count=3)
+# 오류를 (타입, 경로, 메시지 지문)별로 세어 두었다가 10초마다 요약 한 건만 남깁니다.
+error_reporter = ErrorAggregator(error_log, interval=10.0)
+
+# 오류 클래스별 응답 본문을 미리 직렬화해 둡니다. (오류가 쏟아져도 JSON 인코딩을 반복하지 않습니다)
+# 예외 메시지는 내부 정보가 드러날 수 있으므로 응답에 넣지 않고 오류 요약 기록에만 남깁니다.
+ERROR_RESPONSE_BODIES = {
+    error_class: json.dumps({
+        "detail": "데이터 처리 중 오류가 발생했습니다.",
+        "error_type": error_class.__name__,
+    }, ensure_ascii=False).encode("utf-8")
+    for error_class in (ValueError, TypeError, KeyError)
+}
+
+@app.on_event("startup")
+def start_error_reporter():
+    error_log.start()
+    app.state.error_report_task = asyncio.get_event_loop().create_task(error_reporter.run())
+
+@app.on_event("shutdown")
+def stop_error_reporter():
+    task = getattr(app.state, "error_report_task", None)
+    if task is not None:
+        task.cancel()
+    # 마지막 간격에 모은 오류까지 남기고 종료합니다.
+    error_reporter.flush()
+    error_log.close()
+
 @app.exception_handler(ValueError)       # 1. ValueError 처리
 @app.exception_handler(TypeError)        # 2. TypeError 처리
 @app.exception_handler(KeyError)         # 3. KeyError 처리
@@ -14,16 +49,22 @@ async def common_error_handler(request: Request, exc: Exception):
 
     error_type = type(exc).__name__
 
-    print(f"로그: 요청 URL {request.url} 에서 {error_type} 발생: {exc}")
+    # 매번 출력하지 않고 집계만 합니다. (요약은 error.log, 누적 횟수는 /health/errors)
+    error_reporter.record(error_type, route_template(request.scope), str(exc))
+
+    # 하위 클래스(예: UnicodeDecodeError)는 처리기가 등록된 상위 클래스의 응답을 씁니다.
+    for error_class in type(exc).__mro__:
+        body = ERROR_RESPONSE_BODIES.get(error_class)
+        if body is not None:
+            break
+
+    return Response(content=body, status_code=status.HTTP_400_BAD_REQUEST, media_type="application/json")
 
-    return JSONResponse(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        content={
-            "detail": f"데이터 처리 중 오류가 발생했습니다.",
-            "error_type": error_type,
-            "message": str(exc)
-        },
-    )
+
+@app.get("/health/errors")
+def error_stats():
+    """오류 타입, 경로, 메시지 지문별 누적 발생 횟수"""
+    return {**error_reporter.stats(), "log": error_log.stats()}
 
 
 # ----------------------------------------------------
@@ -43,4 +84,3 @@ async def trigger_error(error_type: str):
         return data["non_existent_key"]
 
     return {"status": "OK"}
-
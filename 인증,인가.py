@@ -1,13 +1,27 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from peewee import *  # Peewee 임포트
 import os
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
 from pathlib import Path
 
+from db_pool import create_database
+from ttl_cache import TTLCache
+from bloom_filter import BloomFilter
+from password_hasher import PasswordHasher, PasswordHasherBusyError, pwd_context
+from rate_limiter import (RateLimit, RateLimitExceeded, RateLimitMiddleware, ShardedRateLimiter,
+                          rate_limit_response)
+
 # config.env 파일 경로를 명시적으로 지정
 CONFIG_ENV_FILE = "config.env"
 env_path = Path(__file__).parent / CONFIG_ENV_FILE
@@ -24,7 +38,8 @@ with open(CONFIG_ENV_FILE, "w", encoding="utf-8") as f:
 print("DB_NAME", DB_NAME)
 print("SECRET_KEY", SECRET_KEY)
 
-db = SqliteDatabase(DB_NAME)
+# CRUD.py와 같은 연결 관리자를 사용합니다. (쓰레드별 연결 재사용 + WAL 모드)
+db = create_database(DB_NAME)
 
 class BaseModel(Model):
     class Meta:
@@ -41,11 +56,40 @@ class User(BaseModel):
         # User 테이블 이름을 'user'로 설정
         table_name = 'user'
 
+class RevokedToken(BaseModel):
+    """
+    폐기된 토큰의 jti(또는 로그인 세션 전체를 뜻하는 "family:<id>")를 토큰이 만료될 때까지 보관합니다.
+    만료된 행은 백그라운드 작업이 주기적으로 지웁니다.
+    """
+    jti = CharField(primary_key=True)
+    expires_at = IntegerField(index=True)  # Unix 시간 (초)
+
+    class Meta:
+        table_name = 'revoked_token'
+
     # --- 2. 보안 설정 (기존과 동일) ---
 
 SECRET_KEY = SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 14
+
+# 비밀번호 해시(bcrypt) 전용 쓰레드 풀의 동시 실행 수와 대기 시간 제한
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "4"))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2.0"))
+
+password_hasher = PasswordHasher(pwd_context, PASSWORD_HASH_CONCURRENCY, PASSWORD_HASH_QUEUE_TIMEOUT)
+
+# 요청 한도
+IP_RATE_LIMITS = {
+    "/login": RateLimit(20, 60),        # IP별 로그인 시도: 분당 20번
+    "/refresh": RateLimit(30, 60),      # IP별 토큰 재발급: 분당 30번
+}
+DEFAULT_IP_RATE_LIMIT = RateLimit(300, 60, burst=100)   # 그 밖의 경로: IP별 분당 300번
+LOGIN_USERNAME_RATE_LIMIT = RateLimit(5, 60)            # 같은 사용자 이름으로 로그인 시도: 분당 5번
+SUBJECT_RATE_LIMIT = RateLimit(120, 60, burst=60)       # 인증된 사용자(토큰 sub)별: 분당 120번
+
+rate_limiter = ShardedRateLimiter()
 
 # --- 3. JWT 유틸리티 함수 (기존과 동일) ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -57,10 +101,31 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
+    # 토큰마다 고유한 jti를 넣어 두어야 개별 토큰을 폐기할 수 있습니다.
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    to_encode.setdefault("type", "access")
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(username: str, family: str):
+    """
+    액세스 토큰을 다시 발급받는 데 쓰는 토큰입니다.
+    family는 한 번의 로그인에서 이어지는 토큰들의 묶음 ID로, 로그아웃이나 재사용 감지 시 묶음 전체를 폐기합니다.
+    """
+    return create_access_token(
+        data={"sub": username, "fam": family, "type": "refresh"},
+        expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+def issue_token_pair(username: str, family: Optional[str] = None) -> dict:
+    family = family or uuid.uuid4().hex
+    return {
+        "access_token": create_access_token(data={"sub": username, "fam": family}),
+        "refresh_token": create_refresh_token(username, family),
+        "token_type": "bearer",
+    }
+
 def decode_access_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -68,38 +133,215 @@ def decode_access_token(token: str):
     except JWTError:
         return None
 
+def family_key(claims: dict) -> Optional[str]:
+    family = claims.get("fam")
+    return f"family:{family}" if family else None
+
 # --- 4. DB 연결/해제 의존성 함수 ---
 def get_db():
     """
-    FastAPI 요청이 들어올 때마다 DB를 열고, 응답 후 닫도록 합니다.
+    FastAPI 요청 단위의 DB 의존성입니다.
+    sync 의존성의 시작/종료와 라우트 함수는 서로 다른 쓰레드에서 실행될 수 있으므로,
+    실제 연결은 조회하는 쓰레드에서 db.connection_context()로 빌리고 곧바로 반납합니다.
+    연결 관리자가 실제 연결을 닫지 않고 풀에 돌려놓으므로 요청마다 연결 비용이 들지 않습니다.
     FastAPI의 `yield`를 사용한 의존성입니다.
     """
-    if db.is_closed():
-        db.connect()
-    try:
-        yield  # 이 시점에 라우트 함수가 실행됩니다.
-    finally:
-        if not db.is_closed():
-            db.close()
+    yield db
 
 # --- 5. 사용자 조회 함수 (Peewee 사용) ---
 def get_user_by_username(username: str):
-    try:
-        return User.get(User.username == username)
-    except User.DoesNotExist:
-        return None
+    with db.connection_context():
+        try:
+            return User.get(User.username == username)
+        except User.DoesNotExist:
+            return None
+
+def update_password_hash(username: str, new_hash: str):
+    with db.connection_context():
+        User.update(hashed_password=new_hash).where(User.username == username).execute()
+    # 비밀번호 해시가 바뀌면 캐시된 인증 결과를 믿지 않고 다음 요청에서 다시 검증합니다.
+    invalidate_user_tokens(username)
+
+# --- 5-1. 검증된 토큰 캐시 ---
+TOKEN_CACHE_SIZE = 10000  # 캐시에 보관할 최대 토큰 수
+TOKEN_INDEX_SWEEP_EVERY = 1024  # 토큰을 이만큼 캐싱할 때마다 사용자별 다이제스트 목록에서 빈 항목을 정리합니다.
+
+class VerifiedTokenCache:
+    """
+    서명 검증을 마친 토큰의 클레임과 사용자 정보(username, full_name)를 토큰의 exp까지 보관합니다.
+    - 키는 토큰 원문이 아닌 SHA-256 다이제스트입니다.
+    - 캐시에 있으면 jwt.decode(서명 검증)와 DB 조회를 모두 건너뜁니다.
+    - 사용자 정보가 바뀌거나 삭제되면 invalidate_user()로 그 사용자의 토큰을 모두 지웁니다.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        self._digests_by_user = {}  # username -> {digest, ...}
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str):
+        return self._cache.get(self.digest(token))
+
+    def version(self) -> int:
+        return self._cache.version()
+
+    def put(self, token: str, claims: dict, user: dict, version: int):
+        """
+        version은 검증/조회를 시작하기 전에 받아 둔 값입니다.
+        그 사이에 invalidate_user()가 불렸다면 오래된 사용자 정보이므로 저장하지 않습니다.
+        """
+        ttl = claims.get("exp", 0) - time.time()
+        if ttl <= 0:
+            return
+        key = self.digest(token)
+        if not self._cache.set(key, (claims, user), ttl=ttl, version=version):
+            return
+        with self._lock:
+            digests = self._digests_by_user.setdefault(user["username"], set())
+            digests.add(key)
+            # 만료/축출된 토큰의 다이제스트가 쌓이지 않도록 가끔 정리합니다.
+            if len(digests) > 16:
+                digests.intersection_update({d for d in digests if d in self._cache})
+            self._puts += 1
+            if self._puts % TOKEN_INDEX_SWEEP_EVERY == 0:
+                self._sweep()
+
+    def _sweep(self):
+        """캐시에서 모두 빠진 사용자의 항목을 지웁니다. (self._lock을 잡은 상태에서 호출)"""
+        for username in list(self._digests_by_user):
+            digests = self._digests_by_user[username]
+            digests.intersection_update({d for d in digests if d in self._cache})
+            if not digests:
+                del self._digests_by_user[username]
+
+    def invalidate_user(self, username: str):
+        with self._lock:
+            digests = self._digests_by_user.pop(username, set())
+        self._cache.invalidate(*digests)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+token_cache = VerifiedTokenCache()
+
+
+def invalidate_user_tokens(username: str):
+    """사용자 정보를 수정하거나 삭제한 뒤 호출하여, 캐시된 인증 결과를 지웁니다."""
+    token_cache.invalidate_user(username)
+
+# --- 5-2. 폐기된 토큰 목록 (jti denylist) ---
+DENYLIST_BLOOM_CAPACITY = 100000      # 블룸 필터의 초기 용량 (넘으면 다음 정리 때 두 배로 다시 만듭니다)
+DENYLIST_BLOOM_ERROR_RATE = 0.001     # 블룸 필터 오탐률 (오탐일 때만 DB를 확인합니다)
+DENYLIST_COMPACT_INTERVAL = int(os.getenv("DENYLIST_COMPACT_INTERVAL", "60"))  # 만료 행 정리 주기 (초)
+
+class TokenDenylist:
+    """
+    폐기된 jti를 SQLite(revoked_token)에 저장하고, 그 앞에 메모리 블룸 필터를 둡니다.
+    - 폐기되지 않은 토큰은 블룸 필터에서 "없음"으로 끝나므로 DB를 조회하지 않습니다.
+    - 블룸 필터가 "있을 수 있음"이라고 할 때만 DB에서 확인합니다.
+    - compact()는 만료된 행을 지우고 남은 행으로 필터를 다시 만듭니다.
+      여러 프로세스로 실행할 때 다른 프로세스에서 폐기한 토큰도 이때 반영됩니다.
+    """
+
+    def __init__(self, capacity: int = DENYLIST_BLOOM_CAPACITY, error_rate: float = DENYLIST_BLOOM_ERROR_RATE):
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        # 필터에 키를 추가하는 것과 필터를 새로 만들어 교체하는 것이 겹치지 않게 합니다.
+        self._lock = threading.Lock()
+        self.db_lookups = 0
+        self.compacted_total = 0
+
+    def revoke(self, key: str, expires_at: int) -> bool:
+        """
+        key를 폐기 목록에 넣습니다. 이미 있으면 False를 반환합니다.
+        PK 제약으로 판단하므로, 같은 리프레시 토큰으로 동시에 요청해도 한 요청만 True를 받습니다.
+        """
+        try:
+            with db.connection_context():
+                RevokedToken.insert(jti=key, expires_at=int(expires_at)).execute()
+        except IntegrityError:
+            return False
+        with self._lock:
+            self._bloom.add(key)
+        return True
+
+    def is_revoked(self, *keys: Optional[str]) -> bool:
+        bloom = self._bloom
+        candidates = [key for key in keys if key and key in bloom]
+        if not candidates:
+            return False
+        self.db_lookups += 1
+        with db.connection_context():
+            return (RevokedToken
+                    .select()
+                    .where(RevokedToken.jti.in_(candidates), RevokedToken.expires_at > int(time.time()))
+                    .exists())
+
+    def compact(self) -> int:
+        """만료된 행을 지우고 블룸 필터를 다시 만듭니다. 지운 행 수를 반환합니다."""
+        with self._lock:
+            with db.connection_context():
+                removed = RevokedToken.delete().where(RevokedToken.expires_at <= int(time.time())).execute()
+                keys = [jti for (jti,) in RevokedToken.select(RevokedToken.jti).tuples().iterator()]
+            capacity = self._bloom.capacity
+            while capacity < len(keys):
+                capacity *= 2
+            bloom = BloomFilter(capacity, self.error_rate)
+            for key in keys:
+                bloom.add(key)
+            self._bloom = bloom
+        self.compacted_total += removed
+        return removed
+
+    def stats(self) -> dict:
+        bloom = self._bloom
+        return {
+            "bloom_entries": bloom.count,
+            "bloom_capacity": bloom.capacity,
+            "bloom_size_bytes": (bloom.size + 7) // 8,
+            "db_lookups": self.db_lookups,
+            "compacted_total": self.compacted_total,
+        }
+
+
+token_denylist = TokenDenylist()
+
+async def compact_denylist_periodically():
+    while True:
+        await asyncio.sleep(DENYLIST_COMPACT_INTERVAL)
+        try:
+            await run_in_threadpool(token_denylist.compact)
+        except Exception as e:
+            print(f"ERROR: Failed to compact token denylist: {e}")
 
 # --- 6. JWT 인증 의존성 함수 (Peewee 통합) ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 # `get_db`를 Depends에 추가하여 요청당 DB 연결을 보장합니다.
-def get_current_user(token: str = Depends(oauth2_scheme), db_conn: None = Depends(get_db)):
+def get_current_user(token: str = Depends(oauth2_scheme), db_conn: Database = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # 이미 검증한 토큰이면 서명 검증과 DB 조회 없이 바로 반환합니다.
+    # 캐시된 토큰도 폐기 여부는 매번 확인합니다. (대부분 블룸 필터에서 끝납니다)
+    cached = token_cache.get(token)
+    if cached is not None:
+        claims, current_user = cached
+        if token_denylist.is_revoked(claims.get("jti"), family_key(claims)):
+            raise credentials_exception
+        return dict(current_user)
+
+    cache_version = token_cache.version()
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -108,68 +350,177 @@ def get_current_user(token: str = Depends(oauth2_scheme), db_conn: None = Depend
     if username is None:
         raise credentials_exception
 
+    # 리프레시 토큰으로는 API를 호출할 수 없습니다.
+    if payload.get("type", "access") != "access":
+        raise credentials_exception
+    if token_denylist.is_revoked(payload.get("jti"), family_key(payload)):
+        raise credentials_exception
+
     # 데이터베이스에서 사용자 정보를 조회합니다. (Peewee 사용)
     user = get_user_by_username(username)
     if user is None:
         raise credentials_exception
 
     # Peewee 모델 객체 대신, 필요한 정보를 딕셔너리로 반환합니다.
-    return {"username": user.username, "full_name": user.full_name}
+    current_user = {"username": user.username, "full_name": user.full_name}
+    token_cache.put(token, payload, current_user, cache_version)
+    return dict(current_user)
+
+def get_rate_limited_user(current_user: dict = Depends(get_current_user)):
+    """인증된 사용자마다(토큰의 sub) 요청 수를 제한합니다. IP를 바꿔 가며 호출해도 같은 한도를 씁니다."""
+    rate_limiter.check(f"sub:{current_user['username']}", SUBJECT_RATE_LIMIT)
+    return current_user
 
 app = FastAPI()
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter,
+                   route_limits=IP_RATE_LIMITS, default_limit=DEFAULT_IP_RATE_LIMIT)
 
 @app.on_event("startup")
 def startup():
     """
     FastAPI 서버 시작 시 DB 연결 및 테이블 생성을 시도합니다.
     """
-    db.connect()
-    # User 테이블이 없으면 생성합니다.
-    db.create_tables([User], safe=True)
-
-    # 초기 테스트 사용자 추가 (데이터베이스가 비어 있을 경우)
-    if User.select().count() == 0:
-        try:
-            User.create(
-                username='testuser',
-                hashed_password='password123',  # 실제로는 해싱이 필수입니다.
-                full_name='Test User',
-                email='test@peewee.com'
-            )
-            print("INFO: Initial 'testuser' created.")
-        except Exception as e:
-            print(f"ERROR: Failed to create initial user: {e}")
+    # 작업이 끝나면 연결을 풀에 반납합니다.
+    with db.connection_context():
+        # User 테이블이 없으면 생성합니다.
+        db.create_tables([User, RevokedToken], safe=True)
+
+        # 초기 테스트 사용자 추가 (데이터베이스가 비어 있을 경우)
+        if User.select().count() == 0:
+            try:
+                User.create(
+                    username='testuser',
+                    hashed_password=pwd_context.hash('password123'),  # bcrypt로 해시하여 저장합니다.
+                    full_name='Test User',
+                    email='test@peewee.com'
+                )
+                print("INFO: Initial 'testuser' created.")
+            except Exception as e:
+                print(f"ERROR: Failed to create initial user: {e}")
+
+    # 남아 있는 폐기 목록으로 블룸 필터를 채우고, 주기적으로 만료된 행을 정리합니다.
+    token_denylist.compact()
+    app.state.denylist_compactor = asyncio.get_event_loop().create_task(compact_denylist_periodically())
 
 @app.on_event("shutdown")
 def shutdown():
     """
-    FastAPI 서버 종료 시 DB 연결을 닫습니다.
+    FastAPI 서버 종료 시 풀에 있는 DB 연결을 모두 닫습니다.
     """
-    if not db.is_closed():
-        db.close()
+    compactor = getattr(app.state, "denylist_compactor", None)
+    if compactor is not None:
+        compactor.cancel()
+    db.close_all()
+    password_hasher.shutdown()
     with open(CONFIG_ENV_FILE, "w", encoding="utf-8") as f:
         f.write("\n".join([f"DB_NAME={DB_NAME}", f"SECRET_KEY={SECRET_KEY}"]))
 
 # --- 8. 라우트 정의 (Peewee 통합) ---
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return rate_limit_response(exc.retry_after)
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "로그인 요청이 많습니다. 잠시 후 다시 시도하세요."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.post("/login")
 # DB 연결 의존성을 추가합니다.
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db_conn: None = Depends(get_db)):
-    user = get_user_by_username(form_data.username)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db_conn: Database = Depends(get_db)):
+    """
+    bcrypt 검증은 password_hasher의 전용 쓰레드 풀에서 실행합니다.
+    평문이나 낮은 비용으로 저장된 비밀번호는 로그인에 성공하면 새 해시로 바꿔 저장합니다.
+    """
+    incorrect_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # 비밀번호 추측을 막기 위해 사용자 이름마다 시도 횟수를 제한합니다. (IP 한도는 미들웨어에서 적용)
+    rate_limiter.check(f"login:{form_data.username}", LOGIN_USERNAME_RATE_LIMIT)
+
+    # DB 조회는 동기 작업이므로 쓰레드 풀에서 실행합니다.
+    user = await run_in_threadpool(get_user_by_username, form_data.username)
+    if not user:
+        await password_hasher.dummy_verify(form_data.password)
+        raise incorrect_exception
 
     # Peewee를 통해 조회된 사용자 정보와 비밀번호 비교
-    if not user or user.hashed_password != form_data.password:
+    verified, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not verified:
+        raise incorrect_exception
+    if new_hash is not None:
+        await run_in_threadpool(update_password_hash, user.username, new_hash)
+
+    return issue_token_pair(user.username)
+
+@app.post("/refresh")
+def refresh_access_token(refresh_token: str = Body(..., embed=True)):
+    """
+    리프레시 토큰을 새 액세스 토큰/리프레시 토큰 쌍으로 교환합니다. (rotation)
+    사용한 리프레시 토큰은 바로 폐기되며, 이미 사용한 토큰이 다시 들어오면
+    탈취된 것으로 보고 같은 로그인에서 발급된 토큰(family)을 모두 폐기합니다.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = decode_access_token(refresh_token)
+    if payload is None or payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("fam"):
+        raise invalid_exception
+    if token_denylist.is_revoked(family_key(payload)):
+        raise invalid_exception
+
+    if not token_denylist.revoke(payload["jti"], payload["exp"]):
+        # 재사용 감지: 이 family의 마지막 리프레시 토큰이 만료될 때까지 family 전체를 막습니다.
+        token_denylist.revoke(family_key(payload), time.time() + REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+        raise invalid_exception
+
+    user = get_user_by_username(payload["sub"])
+    if user is None:
+        raise invalid_exception
+    return issue_token_pair(user.username, payload["fam"])
+
+@app.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(token: str = Depends(oauth2_scheme), current_user: dict = Depends(get_rate_limited_user)):
+    """현재 액세스 토큰과, 같은 로그인에서 발급된 리프레시 토큰을 모두 폐기합니다."""
+    payload = decode_access_token(token)
+    if payload is None:
+        # 캐시된 인증 결과로 통과한 뒤 그 사이에 만료된 토큰입니다.
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
+            detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    if payload.get("jti"):
+        token_denylist.revoke(payload["jti"], payload["exp"])
+    if payload.get("fam"):
+        token_denylist.revoke(family_key(payload), time.time() + REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+    # 로그아웃한 사용자의 캐시된 인증 결과도 지웁니다. (다른 세션의 토큰은 다음 요청에서 다시 검증됩니다)
+    invalidate_user_tokens(current_user["username"])
+
+@app.get("/health/token-denylist")
+def read_token_denylist_stats():
+    """블룸 필터 크기와, 블룸 필터를 통과해 DB까지 확인한 횟수를 확인합니다."""
+    return token_denylist.stats()
+
+@app.get("/health/rate-limit")
+def read_rate_limit_stats():
+    """요청 제한기의 키 수와 허용 / 거절 횟수를 확인합니다."""
+    return rate_limiter.stats()
+
+@app.get("/health/password-hash")
+def read_password_hash_stats():
+    """비밀번호 해시 작업의 처리 수, 거절 수, 지연 시간 분포를 확인합니다."""
+    return password_hasher.stats()
 
 @app.get("/public")
 def read_public_data():
@@ -178,17 +529,8 @@ def read_public_data():
 
 @app.get("/protected")
 # JWT 및 DB 연결 의존성을 사용합니다.
-def read_protected_data(current_user: dict = Depends(get_current_user)):
+def read_protected_data(current_user: dict = Depends(get_rate_limited_user)):
     return {
         "message": "이것은 인증된 사용자만 접근 가능한 보호된 데이터입니다. (DB 연동 확인)",
         "user": current_user["username"]
     }
-
-
-
-
-
-
-
-
-
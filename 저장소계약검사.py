@@ -0,0 +1,134 @@
+"""
+핵사고날아키텍처.py의 UserRepositoryPort 어댑터들이 포트의 약속(계약)을 지키는지 확인합니다.
+새 어댑터를 만들면 ADAPTERS에 추가해서 같은 검사를 통과하는지 확인합니다.
+SQLite 어댑터는 임시 폴더의 DB를 사용하므로 실제 DB에는 영향을 주지 않습니다.
+
+실행: python 저장소계약검사.py
+"""
+import os
+import sys
+import tempfile
+import threading
+
+from 핵사고날아키텍처 import MemoryUserRepositoryAdapter, SqliteUserRepositoryAdapter, UserRepositoryPort
+
+TEMP_DIR = tempfile.mkdtemp()
+
+
+def temp_db(name: str) -> str:
+    return os.path.join(TEMP_DIR, f"{name}.db")
+
+
+# 이름 -> 새 어댑터를 만드는 함수. 검사마다 빈 저장소를 새로 만듭니다.
+ADAPTERS = {
+    "memory": lambda case: MemoryUserRepositoryAdapter(),
+    "sqlite (write-behind)": lambda case: SqliteUserRepositoryAdapter(temp_db(f"behind-{case}"), flush_interval=10.0,
+                                                                       max_batch=100),
+    "sqlite (write-through)": lambda case: SqliteUserRepositoryAdapter(temp_db(f"through-{case}"), flush_interval=0),
+}
+
+
+# --- 계약: 모든 어댑터가 통과해야 하는 검사 ---
+
+def check_save_returns_message(repo: UserRepositoryPort):
+    result = repo.save("홍길동")
+    assert isinstance(result, str) and "홍길동" in result, result
+
+
+def check_read_your_writes(repo: UserRepositoryPort):
+    # 쓰기 간격이 지나지 않았어도 직전에 저장한 이름이 보여야 합니다.
+    repo.save("첫번째")
+    repo.save("두번째")
+    assert repo.find_all() == ["첫번째", "두번째"], repo.find_all()
+
+
+def check_order_across_batches(repo: UserRepositoryPort):
+    names = [f"user-{i:04d}" for i in range(1050)]
+    for name in names:
+        repo.save(name)
+    assert repo.find_all() == names
+
+
+def check_special_characters(repo: UserRepositoryPort):
+    names = ["O'Brien", 'say "hi"', "줄\n바꿈", "", "😀", "'); DROP TABLE hexagonal_user; --"]
+    for name in names:
+        repo.save(name)
+    assert repo.find_all() == names, repo.find_all()
+
+
+def check_concurrent_saves(repo: UserRepositoryPort):
+    def worker(prefix):
+        for i in range(200):
+            repo.save(f"{prefix}-{i}")
+
+    threads = [threading.Thread(target=worker, args=(f"t{n}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    saved = repo.find_all()
+    assert sorted(saved) == sorted(f"t{n}-{i}" for n in range(8) for i in range(200)), len(saved)
+    # 쓰레드 하나가 저장한 순서는 유지되어야 합니다.
+    for n in range(8):
+        assert [name for name in saved if name.startswith(f"t{n}-")] == [f"t{n}-{i}" for i in range(200)]
+
+
+def check_close_is_idempotent(repo: UserRepositoryPort):
+    repo.save("마지막")
+    repo.close()
+    repo.close()
+
+
+CONTRACT = [
+    check_save_returns_message,
+    check_read_your_writes,
+    check_order_across_batches,
+    check_special_characters,
+    check_concurrent_saves,
+    check_close_is_idempotent,
+]
+
+
+# --- SQLite 어댑터 전용: 종료 시 대기열이 모두 디스크에 남는지 ---
+
+def check_flush_on_close():
+    path = temp_db("durability")
+    repo = SqliteUserRepositoryAdapter(path, flush_interval=60.0)
+    for i in range(300):
+        repo.save(f"user-{i}")
+    assert repo.stats()["pending"] == 300, repo.stats()
+    repo.close()
+    reopened = SqliteUserRepositoryAdapter(path, flush_interval=60.0)
+    try:
+        assert reopened.find_all() == [f"user-{i}" for i in range(300)]
+    finally:
+        reopened.close()
+
+
+def run() -> int:
+    failures = 0
+    for adapter_name, factory in ADAPTERS.items():
+        for check in CONTRACT:
+            repo = factory(check.__name__)
+            try:
+                check(repo)
+                print(f"PASS  {adapter_name:24} {check.__name__}")
+            except Exception as e:
+                failures += 1
+                print(f"FAIL  {adapter_name:24} {check.__name__}: {type(e).__name__}: {e}")
+            finally:
+                repo.close()
+
+    try:
+        check_flush_on_close()
+        print(f"PASS  {'sqlite':24} check_flush_on_close")
+    except Exception as e:
+        failures += 1
+        print(f"FAIL  {'sqlite':24} check_flush_on_close: {type(e).__name__}: {e}")
+
+    print(f"\n{'모두 통과' if failures == 0 else f'{failures}개 실패'}")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run() else 0)
@@ -0,0 +1,91 @@
+"""
+캐싱.py의 캐시 백엔드를 여러 워커 프로세스에서 사용할 때의 조회 지연 시간과 적중률을 비교합니다.
+- memory : fastapi-cache2의 InMemoryBackend (워커마다 따로 저장)
+- bounded: cache_backend.BoundedMemoryBackend (워커마다 따로 저장, 용량 제한)
+- sqlite : cache_backend.SqliteCacheBackend (임시 파일 하나를 모든 워커가 공유)
+
+각 워커는 같은 키 분포(자주 쓰는 키에 몰리는 Zipf 분포)로 조회하고, 미스이면 값을 계산해서 저장합니다.
+
+실행: python 캐시벤치마크.py [워커 수] [워커당 조회 수] [키 개수]
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+LOOKUPS = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+KEYS = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000
+VALUE_SIZE = 1024    # 캐시에 저장하는 값의 크기 (바이트)
+EXPIRE = 60          # 저장할 때의 만료 시간 (초)
+
+
+def make_backend(kind: str, path: str):
+    from fastapi_cache.backends.inmemory import InMemoryBackend
+    from cache_backend import BoundedMemoryBackend, SqliteCacheBackend
+
+    if kind == "memory":
+        return InMemoryBackend()
+    if kind == "bounded":
+        return BoundedMemoryBackend()
+    return SqliteCacheBackend(path)
+
+
+async def run_worker(kind: str, path: str, seed: int) -> tuple:
+    backend = make_backend(kind, path)
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(KEYS)]
+    keys = rng.choices(range(KEYS), weights=weights, k=LOOKUPS)
+    value = b"x" * VALUE_SIZE
+    latencies = []
+    hits = 0
+    for key in keys:
+        key = f"bench:{key}"
+        started = time.perf_counter()
+        _, cached = await backend.get_with_ttl(key)
+        latencies.append(time.perf_counter() - started)
+        if cached is None:
+            await backend.set(key, value, EXPIRE)
+        else:
+            hits += 1
+    return hits, latencies
+
+
+def worker(kind: str, path: str, seed: int, results):
+    results.put(asyncio.run(run_worker(kind, path, seed)))
+
+
+def measure(kind: str) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    if kind == "sqlite":
+        make_backend(kind, path).close()  # 스키마를 먼저 만들어 둡니다.
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(kind, path, seed, results))
+                 for seed in range(WORKERS)]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = sorted(latency for _, worker_latencies in collected for latency in worker_latencies)
+    hits = sum(worker_hits for worker_hits, _ in collected)
+    return {
+        "hit_ratio": hits / len(latencies),
+        "avg_us": sum(latencies) / len(latencies) * 1e6,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    print(f"워커: {WORKERS}, 워커당 조회: {LOOKUPS:,}, 키: {KEYS:,}, 값 크기: {VALUE_SIZE}B")
+    print(f"{'백엔드':<8} {'적중률':>8} {'평균(us)':>10} {'p50(us)':>10} {'p99(us)':>10}")
+    for kind in ("memory", "bounded", "sqlite"):
+        result = measure(kind)
+        print(f"{kind:<8} {result['hit_ratio']:>8.2%} {result['avg_us']:>10.1f} "
+              f"{result['p50_us']:>10.1f} {result['p99_us']:>10.1f}")
@@ -1,19 +1,43 @@
 #pip install fastapi-cache2
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
-from fastapi_cache.decorator import cache
+import os
 import time
 
+from cache_backend import BoundedMemoryBackend, SqliteCacheBackend
+from cache_decorator import cache
+from response_cache import ResponseCache, ResponseCacheMiddleware
+
 app = FastAPI()
 
+# - memory: 메모리 사용량에 상한이 있고, 만료된 키를 동시에 여러 요청이 다시 계산하지 않는 백엔드
+# - sqlite: 여러 워커(uvicorn --workers N)가 CACHE_DB 파일 하나를 함께 쓰는 백엔드
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_DB = os.getenv("CACHE_DB", "cache.db")
+
+if CACHE_BACKEND == "sqlite":
+    cache_backend = SqliteCacheBackend(CACHE_DB, max_bytes=64 * 1024 * 1024)
+else:
+    cache_backend = BoundedMemoryBackend(max_bytes=64 * 1024 * 1024, policy="lru")
+
+# 경로 -> 인코딩된 응답(본문, 헤더, gzip 압축본)을 보관할 시간(초)
+# 적중하면 엔드포인트와 @cache 데코레이터를 거치지 않고 저장된 바이트를 바로 보냅니다.
+RESPONSE_CACHE_RULES = {
+    "/test-cache": 5,
+}
+
+response_cache = ResponseCache(RESPONSE_CACHE_RULES)
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+
 @app.on_event("startup")
 async def startup():
     # Redis 설치 없이 메모리만 사용하도록 설정
-    FastAPICache.init(InMemoryBackend())
+    FastAPICache.init(cache_backend)
 
 @app.get("/test-cache")
-@cache(expire=10) # 10초 동안 캐싱
+# 10초 동안 캐싱, 만료 후 30초 동안은 이전 값을 바로 응답하면서 백그라운드에서 갱신
+# 갱신이 실패하면 만료 후 5분까지는 이전 값을 계속 응답
+@cache(expire=10, stale_while_revalidate=30, stale_if_error=300)
 async def get_data():
     # 캐싱 확인을 위해 현재 시간을 포함하여 반환
     # 10초 안에는 계속 같은 결과가 나옵니다.
@@ -21,4 +45,14 @@ async def get_data():
     return {
         "message": "10초 동안은 값이 변하지 않습니다.",
         "time": current_time
-    }
\ No newline at end of file
+    }
+
+@app.get("/health/cache")
+async def read_cache_stats():
+    # hit / miss / eviction 횟수와, 다른 요청의 계산을 기다린(coalesced) 횟수를 확인합니다.
+    return cache_backend.stats()
+
+@app.get("/health/response-cache")
+async def read_response_cache_stats():
+    # 인코딩된 응답 캐시의 hit / miss 횟수와 저장 횟수를 확인합니다.
+    return response_cache.stats()
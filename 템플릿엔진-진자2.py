@@ -1,11 +1,15 @@
 from fastapi import FastAPI, Request
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from datetime import datetime
 
+from template_cache import create_templates, warm_up_templates, invalidate_fragments
+from template_stream import stream_template
+
 app = FastAPI()
 
-templates = Jinja2Templates(directory="templates11")
+# 컴파일된 템플릿을 디스크(.jinja_cache)에 저장해 두고, {% cache %} 조각 캐시 태그를 켭니다.
+# enable_async: 렌더링 결과를 generate_async()로 나눠 보내고, async 데이터 소스도 {% for %}에서 돌 수 있습니다.
+templates = create_templates(directory="templates11", enable_async=True)
 
 USER_DATA = {
     "username": "CodingPartner",
@@ -17,8 +21,22 @@ USER_DATA = {
     ]
 }
 
+@app.on_event("startup")
+def warm_up():
+    # 첫 요청이 템플릿 컴파일 비용을 내지 않도록 시작할 때 모두 불러 둡니다.
+    warm_up_templates(templates)
+
+
+def update_user(**fields):
+    """
+    USER_DATA를 바꾸고, 캐싱된 사용자 요약 조각(인사말, 상태)을 지웁니다.
+    USER_DATA를 바꿀 때는 반드시 이 함수를 사용해야 바뀐 값이 바로 보입니다. 예: update_user(status="Offline")
+    """
+    invalidate_fragments(templates, f"user-summary:{USER_DATA['username']}")
+    USER_DATA.update(fields)
+
 @app.get("/", response_class=HTMLResponse)
-def read_home11(request: Request):
+async def read_home11(request: Request):
     """
     홈 페이지를 렌더링하고 데이터를 전달합니다.
     """
@@ -32,5 +50,5 @@ def read_home11(request: Request):
         "user": USER_DATA,
         "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    # templates11.TemplateResponse(템플릿 파일 이름, 컨텍스트 딕셔너리)
-    return templates.TemplateResponse("home.html", context)
\ No newline at end of file
+    # 페이지 전체를 문자열로 만들지 않고, 렌더링되는 대로 나눠서 보냅니다.
+    return stream_template(templates, "home.html", context)
\ No newline at end of file
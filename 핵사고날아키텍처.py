@@ -1,5 +1,21 @@
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from fastapi import FastAPI, Depends
+from collections import deque
+
+from fastapi import FastAPI, Depends, Request
+from peewee import Table
+
+from db_pool import create_database
+
+# 사용할 저장소 어댑터 (sqlite / memory)
+USER_REPOSITORY = os.getenv("USER_REPOSITORY", "sqlite")
+USER_DB = os.getenv("USER_DB", "hexagonal_users.db")
+USER_FLUSH_INTERVAL = float(os.getenv("USER_FLUSH_INTERVAL", "0.05"))   # 모아 둔 저장을 쓰는 간격 (초), 0이면 즉시 씁니다.
+USER_MAX_BATCH = int(os.getenv("USER_MAX_BATCH", "500"))                # 한 트랜잭션에 묶는 최대 저장 수
+USER_MAX_PENDING = 10000       # 아직 쓰지 않은 저장의 최대 수 (넘으면 save가 자리가 날 때까지 기다립니다)
+USER_SAVE_TIMEOUT = 5.0        # save가 자리를 기다리는 최대 시간 (초)
 
 
 # 1. [Port] - 인터페이스 (추상 클래스)
@@ -9,21 +25,153 @@ class UserRepositoryPort(ABC):
     def save(self, name: str) -> str:
         pass
 
-# 2. [Adapter] - 구현체 (MySQL 어댑터)
-# 포트의 명세를 실제로 구현합니다.
-class MySQLUserRepositoryAdapter(UserRepositoryPort):
-    def save(self, name: str) -> str:
-        # 실제로는 DB 저장 로직이 들어갑니다.
+    @abstractmethod
+    def find_all(self) -> list:
+        """저장한 이름을 저장한 순서대로 돌려줍니다. 직전에 save한 이름도 포함해야 합니다."""
+        pass
 
+    def close(self):
+        """애플리케이션 종료 시 호출됩니다. 아직 쓰지 않은 데이터가 있으면 여기서 모두 씁니다."""
+        pass
 
-        return f"MySQL에 '{name}' 저장 완료!"
+    def stats(self) -> dict:
+        return {}
 
-# 3. [Adapter] - 구현체 (메모리 어댑터 / 테스트용)
+# 2. [Adapter] - 구현체 (메모리 어댑터 / 테스트용)
 class MemoryUserRepositoryAdapter(UserRepositoryPort):
+    def __init__(self):
+        self._names = []
+
     def save(self, name: str) -> str:
+        self._names.append(name)
         return f"메모리에 '{name}' 임시 저장!"
 
-# 4. [Service] - 비즈니스 로직
+    def find_all(self) -> list:
+        return list(self._names)
+
+    def stats(self) -> dict:
+        return {"saved": len(self._names)}
+
+# 2-1. [Adapter] - 구현체 (SQLite 어댑터 / write-behind)
+class SqliteUserRepositoryAdapter(UserRepositoryPort):
+    """
+    save()는 이름을 대기열에 넣고 바로 돌아오며, 백그라운드 쓰레드가 모아서 한 트랜잭션으로 씁니다.
+    - flush_interval(초)마다, 또는 max_batch개가 모이면 바로 씁니다. flush_interval이 0이면 save()에서 즉시 씁니다.
+    - close()는 대기열에 남은 것을 모두 쓰고 닫습니다. 그 전에 프로세스가 죽으면 최대
+      flush_interval 동안 모은 저장이 사라질 수 있습니다. (이것이 싫다면 flush_interval=0)
+    - find_all()은 대기열을 먼저 쓰고 조회하므로 직전에 save한 이름도 보입니다.
+    - 쓰기에 실패한 묶음은 대기열 앞에 되돌려 두고 다음 간격에 다시 씁니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS hexagonal_user (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path: str, flush_interval: float = USER_FLUSH_INTERVAL, max_batch: int = USER_MAX_BATCH,
+                 max_pending: int = USER_MAX_PENDING, save_timeout: float = USER_SAVE_TIMEOUT):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.save_timeout = save_timeout
+        self.db = create_database(path)
+        with self.db.connection_context():
+            self.db.execute_sql(self.SCHEMA)
+        self.users = Table("hexagonal_user", ("id", "name", "created_at")).bind(self.db)
+        self._pending = deque()                      # (이름, 저장 요청 시각)
+        self._changed = threading.Condition()        # 대기열이 바뀌면 알립니다. (쓰레드 깨우기 / save 대기 해제)
+        self._write_lock = threading.Lock()          # 묶음을 쓰는 쪽은 한 번에 하나만
+        self._closed = False
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._thread = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name="user-write-behind", daemon=True)
+            self._thread.start()
+
+    def save(self, name: str) -> str:
+        with self._changed:
+            if self._closed:
+                raise RuntimeError("이미 닫힌 저장소입니다.")
+            if not self._changed.wait_for(lambda: len(self._pending) < self.max_pending, self.save_timeout):
+                raise TimeoutError("저장 대기열이 가득 찼습니다.")
+            self._pending.append((name, time.time()))
+            if len(self._pending) >= self.max_batch:
+                self._changed.notify_all()
+        if self._thread is None:
+            self.flush()
+            return f"SQLite에 '{name}' 저장 완료!"
+        return f"SQLite에 '{name}' 저장 예약!"
+
+    def find_all(self) -> list:
+        self.flush()
+        with self.db.connection_context():
+            return [row["name"] for row in self.users.select(self.users.name).order_by(self.users.id)]
+
+    def flush(self):
+        """대기열에 있는 저장을 max_batch개씩 모두 씁니다. 쓰기에 실패하면 예외를 그대로 올립니다."""
+        with self._write_lock:
+            while True:
+                with self._changed:
+                    batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                if not batch:
+                    return
+                try:
+                    with self.db.connection_context():
+                        with self.db.atomic("IMMEDIATE"):
+                            self.users.insert(batch, columns=[self.users.name, self.users.created_at]).execute()
+                except Exception:
+                    with self._changed:
+                        self._pending.extendleft(reversed(batch))
+                        self.errors += 1
+                    raise
+                with self._changed:
+                    self.written += len(batch)
+                    self.batches += 1
+                    self._changed.notify_all()
+
+    def _run(self):
+        while True:
+            with self._changed:
+                if not self._closed and len(self._pending) < self.max_batch:
+                    self._changed.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"ERROR: Failed to write users: {e}")
+                time.sleep(self.flush_interval)
+
+    def close(self):
+        with self._changed:
+            if self._closed:
+                return
+            self._closed = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        finally:
+            self.db.close_all()
+
+    def stats(self) -> dict:
+        with self._changed:
+            return {
+                "pending": len(self._pending),
+                "written": self.written,
+                "batches": self.batches,
+                "errors": self.errors,
+                "flush_interval": self.flush_interval,
+                "max_batch": self.max_batch,
+            }
+
+# 3. [Service] - 비즈니스 로직
 # 특정 어댑터가 아닌 '포트(인터페이스)'에 의존합니다.
 class UserService:
     def __init__(self, repo: UserRepositoryPort):
@@ -32,30 +180,45 @@ class UserService:
     def register_user(self, name: str):
         return self.repo.save(name)
 
+    def list_users(self) -> list:
+        return self.repo.find_all()
+
 # --- 주입(Injection) 설정 ---
 
 app = FastAPI()
 
-# 스프링의 컴포넌트 스캔 대신, 수동으로 구현체를 선택하여 주입하는 함수입니다.
-def get_user_service() -> UserService:
-    # 여기서 원하는 어댑터를 선택합니다. (전략 패턴)
-    # 나중에 MySQL 대신 다른 걸로 바꾸고 싶다면 여기만 수정하면 됩니다.
-    #repository_adapter = MySQLUserRepositoryAdapter()
-    repository_adapter = MemoryUserRepositoryAdapter()
-    return UserService(repository_adapter)
-
-# 5. [Controller] - API 엔드포인트
+# 여기서 원하는 어댑터를 선택합니다. (전략 패턴)
+# 나중에 다른 저장소로 바꾸고 싶다면 여기만 수정하면 됩니다.
+def create_user_repository() -> UserRepositoryPort:
+    if USER_REPOSITORY == "memory":
+        return MemoryUserRepositoryAdapter()
+    # 다른 저장소(MySQL 등) 어댑터를 만들면 여기에 선택지를 추가합니다.
+    return SqliteUserRepositoryAdapter(USER_DB)
+
+# 어댑터와 서비스는 애플리케이션이 시작할 때 한 번만 만들고, 종료할 때 닫습니다.
+@app.on_event("startup")
+def create_user_service():
+    app.state.user_service = UserService(create_user_repository())
+
+@app.on_event("shutdown")
+def close_user_service():
+    # write-behind 대기열에 남은 저장을 모두 쓰고 닫습니다.
+    app.state.user_service.repo.close()
+
+# 스프링의 컴포넌트 스캔 대신, 시작 시 만들어 둔 서비스를 주입하는 함수입니다.
+def get_user_service(request: Request) -> UserService:
+    return request.app.state.user_service
+
+# 4. [Controller] - API 엔드포인트
 @app.post("/users")
 def create_user(name: str, service: UserService = Depends(get_user_service)):
     test1 = Depends(get_user_service)
     return {"result": service.register_user(name)}
 
+@app.get("/users")
+def list_users(service: UserService = Depends(get_user_service)):
+    return {"users": service.list_users()}
 
-
-
-
-
-
-
-
-
+@app.get("/health/user-repository")
+def user_repository_stats(service: UserService = Depends(get_user_service)):
+    return {"adapter": type(service.repo).__name__, **service.repo.stats()}